@@ -13,32 +13,66 @@ Usage:
     python3 scripts/bootstrap.py list-connections
     python3 scripts/bootstrap.py init-workspace [--environment-url ...] [--jira ...] [--ado ...] [--dataverse ...]
     python3 scripts/bootstrap.py init-ticket <ticket-id>
+    python3 scripts/bootstrap.py --version
 """
 
 import argparse
-import json
 import os
-import subprocess
 import sys
 from pathlib import Path
 
 PLUGIN_ROOT = Path(__file__).resolve().parent.parent
 VENV_DIR = PLUGIN_ROOT / ".venv"
 REQUIREMENTS = PLUGIN_ROOT / "requirements.txt"
+PLUGIN_MANIFEST = PLUGIN_ROOT / ".claude-plugin" / "plugin.json"
+
+DESCRIPTION = "OpsKit bootstrap — venv setup, connection management, provider status."
+
+# Subcommand name → help text (shared by the full parser and the --help fast path)
+COMMANDS = {
+    "setup": "Create venv and install dependencies",
+    "status": "Check all providers and print readiness report",
+    "check": "Check a single provider",
+    "add-connection": "Add a named connection",
+    "remove-connection": "Remove a named connection",
+    "set-default": "Set default connection for a provider",
+    "list-connections": "List all connections (secrets masked)",
+    "init-workspace": "Create/update ops/opskit.json",
+    "init-ticket": "Scaffold workspace for a ticket investigation",
+}
+
+# Connection fields masked by list-connections
+_SECRET_KEYS = frozenset({"api_token", "client_secret"})
+
+
+def _plugin_version() -> str:
+    import json
+    try:
+        with open(PLUGIN_MANIFEST, "r") as f:
+            return json.load(f).get("version", "unknown")
+    except (OSError, ValueError):
+        return "unknown"
+
+
+def _fast_path() -> None:
+    """Answer bare/--help/--version invocations without building the full parser."""
+    argv = sys.argv[1:]
+    if argv and argv[0] not in ("-h", "--help", "--version"):
+        return
+    if argv and argv[0] == "--version":
+        print(f"opskit {_plugin_version()}")
+        sys.exit(0)
+
+    parser = argparse.ArgumentParser(description=DESCRIPTION)
+    sub = parser.add_subparsers(dest="command")
+    for name, help_text in COMMANDS.items():
+        sub.add_parser(name, help=help_text)
+    parser.print_help()
+    sys.exit(0)
+
 
-# Import preflight from skills/_shared/
+# Make skills/_shared/ importable; preflight itself is imported per command
 sys.path.insert(0, str(PLUGIN_ROOT / "skills"))
-from _shared.preflight import (
-    check_all,
-    check_provider,
-    load_config,
-    load_connections,
-    load_workspace,
-    print_status,
-    save_config,
-    save_connections,
-    save_workspace,
-)
 
 
 def _venv_python() -> Path:
@@ -54,20 +88,27 @@ def _venv_python() -> Path:
 
 def cmd_setup(_args: argparse.Namespace) -> None:
     """Create virtual environment and install dependencies."""
+    import subprocess
+    import venv
+
     venv_python = _venv_python()
 
+    # Build the venv in-process rather than spawning `python -m venv`.
     if not venv_python.exists():
         print(f"Creating virtual environment at {VENV_DIR} ...", file=sys.stderr)
-        subprocess.check_call([sys.executable, "-m", "venv", str(VENV_DIR)])
+        venv.EnvBuilder(with_pip=True, upgrade_deps=False).create(str(VENV_DIR))
     else:
         print(f"Virtual environment already exists at {VENV_DIR}", file=sys.stderr)
 
     if REQUIREMENTS.exists():
         print("Installing dependencies ...", file=sys.stderr)
-        subprocess.check_call([
+        # close_fds=False lets CPython 3.11/3.12 use posix_spawn() instead of
+        # fork()+exec() (see CPython issue #113117). No-op on Windows.
+        subprocess.run([
             str(venv_python), "-m", "pip", "install",
-            "--quiet", "--upgrade", "-r", str(REQUIREMENTS),
-        ])
+            "--quiet", "--upgrade", "--disable-pip-version-check", "--no-input",
+            "-r", str(REQUIREMENTS),
+        ], check=True, close_fds=False)
     else:
         print(f"No requirements.txt found at {REQUIREMENTS}", file=sys.stderr)
 
@@ -76,12 +117,16 @@ def cmd_setup(_args: argparse.Namespace) -> None:
 
 def cmd_status(args: argparse.Namespace) -> None:
     """Check all providers and print readiness report."""
+    from _shared.preflight import check_all, print_status
+
     statuses = check_all()
     print_status(statuses, fmt=getattr(args, "format", "text"))
 
 
 def cmd_check(args: argparse.Namespace) -> None:
     """Check a single provider."""
+    from _shared.preflight import check_provider, print_status
+
     status = check_provider(args.provider)
     print_status({args.provider: status}, fmt=getattr(args, "format", "text"))
     if not status.ready:
@@ -90,6 +135,8 @@ def cmd_check(args: argparse.Namespace) -> None:
 
 def cmd_add_connection(args: argparse.Namespace) -> None:
     """Add a named connection. Uses CLI flags if provided, else interactive prompts."""
+    from _shared.preflight import load_config, load_connections, save_config, save_connections
+
     provider = args.provider
     name = args.name
     connections = load_connections()
@@ -110,14 +157,17 @@ def cmd_add_connection(args: argparse.Namespace) -> None:
 
     # Set as default if it's the first connection for this provider
     config = load_config()
-    if not config.get("defaults", {}).get(provider):
-        config.setdefault("defaults", {})[provider] = name
+    defaults = config.setdefault("defaults", {})
+    if not defaults.get(provider):
+        defaults[provider] = name
         save_config(config)
         print(f"Set '{name}' as default for {provider}.", file=sys.stderr)
 
 
 def cmd_remove_connection(args: argparse.Namespace) -> None:
     """Remove a named connection."""
+    from _shared.preflight import load_config, load_connections, save_config, save_connections
+
     connections = load_connections()
     provider_conns = connections.get(args.provider, {})
     if args.name not in provider_conns:
@@ -130,27 +180,33 @@ def cmd_remove_connection(args: argparse.Namespace) -> None:
 
     # Clear default if it pointed to the removed connection
     config = load_config()
-    if config.get("defaults", {}).get(args.provider) == args.name:
-        config["defaults"].pop(args.provider, None)
+    defaults = config.setdefault("defaults", {})
+    if defaults.get(args.provider) == args.name:
+        del defaults[args.provider]
         save_config(config)
         print(f"Default for {args.provider} cleared (was '{args.name}').", file=sys.stderr)
 
 
 def cmd_set_default(args: argparse.Namespace) -> None:
     """Set the default connection for a provider."""
+    from _shared.preflight import load_config, load_connections, save_config
+
     connections = load_connections()
     if args.name not in connections.get(args.provider, {}):
         print(f"Connection '{args.name}' not found for {args.provider}.", file=sys.stderr)
         sys.exit(1)
 
     config = load_config()
-    config.setdefault("defaults", {})[args.provider] = args.name
+    defaults = config.setdefault("defaults", {})
+    defaults[args.provider] = args.name
     save_config(config)
     print(f"Default for {args.provider} set to '{args.name}'.", file=sys.stderr)
 
 
 def cmd_list_connections(_args: argparse.Namespace) -> None:
     """List all connections (secrets masked)."""
+    from _shared.preflight import load_config, load_connections
+
     connections = load_connections()
     config = load_config()
     defaults = config.get("defaults", {})
@@ -160,20 +216,27 @@ def cmd_list_connections(_args: argparse.Namespace) -> None:
         print(f"  Run: python3 {PLUGIN_ROOT}/scripts/bootstrap.py add-connection <provider> <name>")
         return
 
+    lines = []
     for provider, conns in connections.items():
         default_name = defaults.get(provider, "")
-        print(f"\n{provider}:")
+        lines.append(f"\n{provider}:")
         for name, conn in conns.items():
             marker = " (default)" if name == default_name else ""
-            print(f"  {name}{marker}:")
+            lines.append(f"  {name}{marker}:")
             for k, v in conn.items():
-                if k in ("api_token", "client_secret"):
-                    v = v[:4] + "***" if len(str(v)) > 4 else "***"
-                print(f"    {k}: {v}")
+                if k in _SECRET_KEYS:
+                    s = str(v)
+                    v = s[:4] + "***" if len(s) > 4 else "***"
+                lines.append(f"    {k}: {v}")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def cmd_init_workspace(args: argparse.Namespace) -> None:
     """Create or update ops/opskit.json in the current working directory."""
+    import json
+
+    from _shared.preflight import load_workspace, save_workspace
+
     ws = load_workspace()
 
     if args.environment_url:
@@ -201,6 +264,8 @@ def cmd_init_workspace(args: argparse.Namespace) -> None:
 
 def cmd_init_ticket(args: argparse.Namespace) -> None:
     """Scaffold the workspace for a new ticket investigation."""
+    from _shared.preflight import check_all, load_workspace, print_status, save_workspace
+
     ticket_id = args.ticket_id
 
     # 1. Check provider status
@@ -339,22 +404,22 @@ def _prompt_dataverse() -> dict:
 
 
 def main() -> None:
-    parser = argparse.ArgumentParser(
-        description="OpsKit bootstrap — venv setup, connection management, provider status.",
-    )
+    _fast_path()
+
+    parser = argparse.ArgumentParser(description=DESCRIPTION)
     sub = parser.add_subparsers(dest="command")
     sub.required = True
 
-    sub.add_parser("setup", help="Create venv and install dependencies")
+    sub.add_parser("setup", help=COMMANDS["setup"])
 
-    p_status = sub.add_parser("status", help="Check all providers and print readiness report")
+    p_status = sub.add_parser("status", help=COMMANDS["status"])
     p_status.add_argument("--format", choices=["text", "json"], default="text", help="Output format")
 
-    p_check = sub.add_parser("check", help="Check a single provider")
+    p_check = sub.add_parser("check", help=COMMANDS["check"])
     p_check.add_argument("provider", choices=["jira", "ado", "dataverse"])
     p_check.add_argument("--format", choices=["text", "json"], default="text", help="Output format")
 
-    p_add = sub.add_parser("add-connection", help="Add a named connection")
+    p_add = sub.add_parser("add-connection", help=COMMANDS["add-connection"])
     p_add.add_argument("provider", choices=["jira", "ado", "dataverse"])
     p_add.add_argument("name", help="Connection name (e.g. 'main', 'partner')")
     p_add.add_argument("--server", help="Jira server URL")
@@ -364,23 +429,23 @@ def main() -> None:
     p_add.add_argument("--project", help="ADO project name")
     p_add.add_argument("--tenant-id", dest="tenant_id", help="Azure tenant ID (ADO/Dataverse)")
 
-    p_rm = sub.add_parser("remove-connection", help="Remove a named connection")
+    p_rm = sub.add_parser("remove-connection", help=COMMANDS["remove-connection"])
     p_rm.add_argument("provider", choices=["jira", "ado", "dataverse"])
     p_rm.add_argument("name")
 
-    p_def = sub.add_parser("set-default", help="Set default connection for a provider")
+    p_def = sub.add_parser("set-default", help=COMMANDS["set-default"])
     p_def.add_argument("provider", choices=["jira", "ado", "dataverse"])
     p_def.add_argument("name")
 
-    sub.add_parser("list-connections", help="List all connections (secrets masked)")
+    sub.add_parser("list-connections", help=COMMANDS["list-connections"])
 
-    p_ws = sub.add_parser("init-workspace", help="Create/update ops/opskit.json")
+    p_ws = sub.add_parser("init-workspace", help=COMMANDS["init-workspace"])
     p_ws.add_argument("--environment-url", dest="environment_url", help="Dataverse environment URL")
     p_ws.add_argument("--jira", help="Jira connection name")
     p_ws.add_argument("--ado", help="ADO connection name")
     p_ws.add_argument("--dataverse", help="Dataverse connection name")
 
-    p_ticket = sub.add_parser("init-ticket", help="Scaffold workspace for a ticket investigation")
+    p_ticket = sub.add_parser("init-ticket", help=COMMANDS["init-ticket"])
     p_ticket.add_argument("ticket_id", help="Ticket ID (e.g. CASE-1234)")
 
     args = parser.parse_args()
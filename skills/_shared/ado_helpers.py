@@ -0,0 +1,258 @@
+"""Shared Azure DevOps helpers for opskit skills — pure Python stdlib, no third-party deps.
+
+Access tokens come from `az account get-access-token` and are cached in memory
+and on disk (see _shared.token_cache) until shortly before they expire. Git and
+Search REST calls go through the pooled keep-alive client in _shared.http.
+"""
+
+import sys
+from dataclasses import dataclass
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+from _shared import json_io, token_cache
+from _shared.http import (
+    HTTPError,
+    get_json_revalidated,
+    get_revalidated,
+    request,
+    request_json,
+    with_retry,
+)
+
+# Azure DevOps application ID, used as the token resource
+ADO_RESOURCE = "499b84ac-1321-427f-aa17-267ca6975798"
+
+
+@dataclass(frozen=True, slots=True)
+class AdoContext:
+    """REST base URLs for one organization/project, quoted once per process."""
+    git_base: str
+    search_base: str
+
+    @classmethod
+    def from_connection(cls, org: str, project: str) -> "AdoContext":
+        """Build from the connection's organization URL (or bare name) and project."""
+        org_name = quote(org.rstrip("/").rsplit("/", 1)[-1])
+        project = quote(project)
+        return cls(
+            git_base=f"https://dev.azure.com/{org_name}/{project}/_apis/git/repositories",
+            search_base=f"https://almsearch.dev.azure.com/{org_name}/{project}/_apis/search",
+        )
+
+
+# ---------------------------------------------------------------------------
+# Access token
+# ---------------------------------------------------------------------------
+
+
+def _parse_token_expiry(token_info: Dict[str, Any]) -> float:
+    """Epoch seconds at which an `az account get-access-token` token expires."""
+    # Newer az versions emit expires_on (epoch); older ones only expiresOn
+    # as a naive local timestamp.
+    if token_info.get("expires_on"):
+        return float(token_info["expires_on"])
+    from datetime import datetime
+    try:
+        return datetime.fromisoformat(token_info["expiresOn"]).timestamp()
+    except (KeyError, TypeError, ValueError):
+        return 0.0
+
+
+def get_access_token(resource: str = ADO_RESOURCE) -> str:
+    """
+    Get an Azure DevOps access token via `az account get-access-token`.
+
+    Tokens are valid for about an hour, so they go through _shared.token_cache
+    and are reused by later invocations until shortly before expiry.
+    """
+    cached = token_cache.lookup(resource)
+    if cached:
+        return cached[0]
+
+    import subprocess
+    result = subprocess.run(
+        ["az", "account", "get-access-token", "--resource", resource, "--output", "json"],
+        capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        print(f"Failed to get access token: {result.stderr.strip()}", file=sys.stderr)
+        sys.exit(1)
+    token_info = json_io.loads(result.stdout)
+    token_cache.store(resource, token_info["accessToken"], _parse_token_expiry(token_info))
+    return token_info["accessToken"]
+
+
+# ---------------------------------------------------------------------------
+# Git operations via REST API
+# ---------------------------------------------------------------------------
+
+
+def fetch_repos(ctx: AdoContext, name_filter: Optional[str] = None,
+                top: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    List the project's repositories using the Git Repositories REST API.
+
+    The API has no paging, so name_filter (case-insensitive substring) and
+    top are applied here, before the results are reshaped.
+    """
+    token = get_access_token()
+    url = f"{ctx.git_base}?api-version=7.1"
+    data = with_retry(lambda: request_json("GET", url, headers={"Authorization": f"Bearer {token}"}))
+    repos = data.get("value", [])
+    if name_filter:
+        needle = name_filter.lower()
+        repos = [r for r in repos if needle in r["name"].lower()]
+    if top is not None:
+        repos = repos[:top]
+    return [
+        {
+            "name": r["name"],
+            "id": r["id"],
+            "default_branch": r.get("defaultBranch", ""),
+            "web_url": r.get("webUrl", ""),
+        }
+        for r in repos
+    ]
+
+
+def fetch_files(ctx: AdoContext, repo: str, path: str, revalidate: bool = True,
+                recursion: str = "OneLevel") -> List[Dict[str, Any]]:
+    """
+    List files/directories at a path using the Git Items REST API.
+
+    recursion is the API's recursionLevel: "OneLevel" for direct children,
+    "Full" for the whole subtree. With revalidate, the listing goes through the on-disk ETag cache, so an
+    unchanged directory costs a 304 instead of a full response.
+    """
+    token = get_access_token()
+    url = (
+        f"{ctx.git_base}/{quote(repo)}"
+        f"/items?scopePath={quote(path)}&recursionLevel={recursion}&api-version=7.1"
+    )
+    headers = {"Authorization": f"Bearer {token}"}
+    if revalidate:
+        data = with_retry(lambda: get_json_revalidated(url, headers=headers))
+    else:
+        data = with_retry(lambda: request_json("GET", url, headers=headers))
+    items = data.get("value", [])
+    return [{"path": i["path"], "is_folder": i.get("isFolder", False)} for i in items]
+
+
+def fetch_file(ctx: AdoContext, repo: str, path: str, revalidate: bool = False) -> str:
+    """Get file contents using the Git Items REST API, via the ETag cache with revalidate."""
+    token = get_access_token()
+    url = f"{ctx.git_base}/{quote(repo)}/items?path={quote(path)}&api-version=7.1"
+    headers = {"Authorization": f"Bearer {token}", "Accept": "application/octet-stream"}
+    if revalidate:
+        return with_retry(lambda: get_revalidated(url, headers=headers)).decode(
+            "utf-8", errors="replace")
+    with with_retry(lambda: request("GET", url, headers=headers)) as resp:
+        return resp.read().decode("utf-8", errors="replace")
+
+
+def stream_file(ctx: AdoContext, repo: str, path: str, out: BinaryIO,
+                revalidate: bool = False) -> None:
+    """
+    Write a file's raw bytes to the binary stream out, without decoding.
+
+    Without revalidate the body is copied in chunks straight from the
+    connection, so memory use does not grow with file size. The ETag cache
+    needs the whole body, so with revalidate it is written in one piece.
+    """
+    token = get_access_token()
+    url = f"{ctx.git_base}/{quote(repo)}/items?path={quote(path)}&api-version=7.1"
+    headers = {"Authorization": f"Bearer {token}", "Accept": "application/octet-stream"}
+    if revalidate:
+        out.write(with_retry(lambda: get_revalidated(url, headers=headers)))
+        return
+    import shutil
+    with with_retry(lambda: request("GET", url, headers=headers)) as resp:
+        shutil.copyfileobj(resp, out)
+
+
+# ---------------------------------------------------------------------------
+# Code search via Azure DevOps Search REST API
+# ---------------------------------------------------------------------------
+
+
+def fetch_search(ctx: AdoContext, query: str,
+                 repo_filter: Optional[str] = None,
+                 path_filter: Optional[str] = None,
+                 extension_filter: Optional[str] = None,
+                 top: int = 25) -> Tuple[List[Dict[str, Any]], int]:
+    """Search code using the Azure DevOps Search REST API. Returns (results, total count)."""
+    token = get_access_token()
+    url = f"{ctx.search_base}/codesearchresults?api-version=7.1"
+
+    filters: Dict[str, List[str]] = {}
+    if repo_filter:
+        filters["Repository"] = [repo_filter]
+    # Path and CodeElement filters require Repository filter in the API,
+    # so we use inline search syntax (path:, ext:) instead of filter objects
+    # when no repository is specified.
+    if repo_filter:
+        if path_filter:
+            filters["Path"] = [path_filter]
+        if extension_filter:
+            filters["CodeElement"] = [extension_filter]
+
+    # Build search text with inline filters for path/extension
+    search_text = query
+    if path_filter and "path:" not in query:
+        search_text += f" path:{path_filter}"
+    if extension_filter and "ext:" not in query:
+        search_text += f" ext:{extension_filter}"
+
+    body = {
+        "searchText": search_text,
+        "$top": top,
+        "$skip": 0,
+        "filters": filters if filters else {},
+    }
+
+    print(f"  Searching: {search_text}", file=sys.stderr)
+    data = with_retry(lambda: request_json(
+        "POST", url, headers={"Authorization": f"Bearer {token}"}, json_body=body))
+
+    results = []
+    for r in data.get("results", []):
+        results.append({
+            "repository": r.get("repository", {}).get("name", ""),
+            "path": r.get("path", ""),
+            "filename": r.get("fileName", ""),
+            "project": r.get("project", {}).get("name", ""),
+            "matches": [
+                {"content": h.get("content", ""), "charOffset": h.get("charOffset", 0)}
+                for h in r.get("matches", {}).get("content", [])
+            ] if r.get("matches") else [],
+        })
+    return results, data.get("count", len(results))
+
+
+# ---------------------------------------------------------------------------
+# Git history via REST API
+# ---------------------------------------------------------------------------
+
+
+def fetch_history(ctx: AdoContext, repo: str, path: Optional[str] = None,
+                  top: int = 10) -> List[Dict[str, Any]]:
+    """Recent commits for a file or repo using the Git Commits REST API."""
+    token = get_access_token()
+    url = f"{ctx.git_base}/{quote(repo)}/commits?$top={top}&api-version=7.1"
+    if path:
+        url += f"&searchCriteria.itemPath={quote(path)}"
+
+    data = with_retry(lambda: request_json("GET", url, headers={"Authorization": f"Bearer {token}"}))
+
+    # commitId, author and comment are always present on GitCommitRef
+    return [
+        {
+            "commitId": c["commitId"][:12],
+            "author": c["author"]["name"],
+            "date": c["author"]["date"],
+            "message": c["comment"].strip(),
+            "url": c.get("remoteUrl", ""),
+        }
+        for c in data.get("value", [])
+    ]
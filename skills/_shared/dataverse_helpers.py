@@ -4,8 +4,24 @@ import base64
 import json
 import os
 import sys
+import weakref
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+from _shared.json_io import dumps as dumps_json
+
+__all__ = [
+    "add_auth_args",
+    "add_output_args",
+    "create_client",
+    "create_credential",
+    "format_output",
+    "is_odata_annotation",
+    "print_records",
+    "query_odata",
+    "strip_annotations",
+    "validate_auth_args",
+]
 
 
 def _ensure_venv() -> None:
@@ -22,11 +38,23 @@ def _ensure_venv() -> None:
     else:
         venv_python = venv_dir / "bin" / "python3"
 
+    # Cheap string comparison first — the common case when scripts are invoked
+    # with the venv interpreter directly.
+    if sys.executable == str(venv_python):
+        return
+
     # sys.prefix points to the active virtual environment root; if it already
     # matches our venv, we're running in the right interpreter — do nothing.
     if not venv_python.exists() or Path(sys.prefix).resolve() == venv_dir.resolve():
         return
 
+    if sys.platform == "win32":
+        # os.execv on Windows spawns a new process and returns control to the
+        # shell early, so run the child and propagate its exit code instead.
+        import subprocess
+        proc = subprocess.run([str(venv_python)] + sys.argv, close_fds=False)
+        sys.exit(proc.returncode)
+
     os.execv(str(venv_python), [str(venv_python)] + sys.argv)
 
 
@@ -65,19 +93,123 @@ def validate_auth_args(args) -> None:
         args.interactive = True
 
 
+# credential → {scope: decoded identity}; entries go away with the credential
+_identity_cache: "weakref.WeakKeyDictionary[Any, Dict[str, Dict[str, str]]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
 def _get_identity_from_token(credential, environment_url: str) -> Optional[Dict[str, str]]:
-    """Decode the JWT access token to extract user/tenant info."""
+    """Decode the JWT access token to extract user/tenant info.
+
+    The decoded identity is cached per credential and scope so repeat lookups
+    in the same process skip the token round-trip.
+    """
+    scope = f"{environment_url.rstrip('/')}/.default"
+    cached = _identity_cache.get(credential, {}).get(scope)
+    if cached:
+        return cached
     try:
-        token = credential.get_token(f"{environment_url.rstrip('/')}/.default")
-        payload = token.token.split(".")[1]
-        payload += "=" * (4 - len(payload) % 4)
-        claims = json.loads(base64.b64decode(payload))
-        return {
+        token = credential.get_token(scope)
+        _header, payload, _signature = token.token.split(".", 2)
+        # JWT segments are unpadded base64url; surplus padding is ignored
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=="))
+        identity = {
             "username": claims.get("upn", claims.get("unique_name", "unknown")),
             "tenant_id": claims.get("tid", "unknown"),
         }
     except Exception:
         return None
+    _identity_cache.setdefault(credential, {})[scope] = identity
+    return identity
+
+
+class _CachedCliCredential:
+    """Wraps AzureCliCredential so its tokens persist in _shared.token_cache.
+
+    AzureCliCredential spawns `az account get-access-token` for every new
+    process; with the cache, only the first invocation per hour pays for it.
+    Requests with claims or a tenant override always go to the az CLI.
+    """
+
+    def __init__(self, inner):
+        self._inner = inner
+
+    def get_token(self, *scopes: str, **kwargs):
+        if any(kwargs.values()):
+            return self._inner.get_token(*scopes, **kwargs)
+        from azure.core.credentials import AccessToken
+        from _shared import token_cache
+
+        key = "az-cli:" + " ".join(scopes)
+        cached = token_cache.lookup(key)
+        if cached:
+            return AccessToken(cached[0], int(cached[1]))
+        token = self._inner.get_token(*scopes)
+        token_cache.store(key, token.token, token.expires_on)
+        return token
+
+    def close(self) -> None:
+        self._inner.close()
+
+    def __enter__(self) -> "_CachedCliCredential":
+        self._inner.__enter__()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self._inner.__exit__(*args)
+
+
+class _StickyChainedCredential:
+    """Tries credentials in order, remembering the one that answered.
+
+    A replacement for azure-identity's ChainedTokenCredential. The SDK asks
+    for a token on every request and a plain chain walks all sources each
+    time; without `az login` that is an az subprocess per request before the
+    browser credential answers. Later calls go straight to the source that
+    answered, back to the full chain if it stops working.
+    """
+
+    def __init__(self, *credentials):
+        self._credentials = credentials
+        self._selected = None
+
+    def get_token(self, *scopes: str, **kwargs):
+        from azure.core.exceptions import ClientAuthenticationError
+        from azure.identity import CredentialUnavailableError
+
+        selected = self._selected
+        if selected is not None:
+            try:
+                return selected.get_token(*scopes, **kwargs)
+            except ClientAuthenticationError:
+                self._selected = None
+
+        unavailable = []
+        for credential in self._credentials:
+            try:
+                token = credential.get_token(*scopes, **kwargs)
+            except CredentialUnavailableError as e:
+                unavailable.append(f"{type(credential).__name__}: {e}")
+                continue
+            self._selected = credential
+            return token
+        raise ClientAuthenticationError(
+            "No credential could get a token.\n" + "\n".join(unavailable)
+        )
+
+    def close(self) -> None:
+        for credential in self._credentials:
+            credential.close()
+
+    def __enter__(self) -> "_StickyChainedCredential":
+        for credential in self._credentials:
+            credential.__enter__()
+        return self
+
+    def __exit__(self, *args) -> None:
+        for credential in self._credentials:
+            credential.__exit__(*args)
 
 
 def create_credential(
@@ -90,22 +222,18 @@ def create_credential(
     """
     Create an Azure credential for Dataverse / Power Platform access.
 
-    Interactive auth tries Azure CLI first (silent if 'az login' was done),
-    then falls back to browser prompt.
+    Interactive auth tries Azure CLI first (silent if 'az login' was done;
+    its tokens are cached on disk across runs), then falls back to browser prompt.
     """
-    from azure.identity import (
-        AzureCliCredential,
-        ChainedTokenCredential,
-        ClientSecretCredential,
-        InteractiveBrowserCredential,
-    )
-
+    # Import only the credential classes the chosen auth mode needs
     if interactive:
-        credential = ChainedTokenCredential(
-            AzureCliCredential(),
+        from azure.identity import AzureCliCredential, InteractiveBrowserCredential
+        credential = _StickyChainedCredential(
+            _CachedCliCredential(AzureCliCredential()),
             InteractiveBrowserCredential(),
         )
     elif tenant_id and client_id and client_secret:
+        from azure.identity import ClientSecretCredential
         credential = ClientSecretCredential(tenant_id, client_id, client_secret)
     else:
         raise ValueError(
@@ -147,8 +275,13 @@ def create_client(
 
 
 def is_odata_annotation(key: str) -> bool:
-    """Check if a key is an OData annotation (metadata, not user data)."""
-    return key.startswith("@") or "@OData" in key or "@Microsoft" in key
+    """Check if a key is an OData annotation (metadata, not user data).
+
+    Annotations are either bare ("@odata.etag") or attached to a property
+    ("name@OData.Community.Display.V1.FormattedValue"); column logical names
+    never contain "@", so a single substring test covers both forms.
+    """
+    return "@" in key
 
 
 def strip_annotations(record: Dict[str, Any]) -> Dict[str, Any]:
@@ -164,7 +297,8 @@ def query_odata(
     orderby: Optional[List[str]] = None,
     top: Optional[int] = None,
     include_annotations: bool = False,
-) -> List[Dict[str, Any]]:
+    materialize: bool = True,
+) -> Union[List[Dict[str, Any]], Iterator[Dict[str, Any]]]:
     """
     Query Dataverse using OData parameters.
 
@@ -176,6 +310,7 @@ def query_odata(
         orderby: List of order by expressions (e.g., ["createdon desc"])
         top: Maximum number of results to return
         include_annotations: If True, keep OData annotations (formatted values, etag, etc.)
+        materialize: If False, return a generator that yields records as pages arrive
     """
     kwargs: Dict[str, Any] = {}
     if select:
@@ -187,17 +322,49 @@ def query_odata(
     if top is not None:
         kwargs["top"] = top
 
-    pages = client.get(table_name, **kwargs)
+    pages = _prefetch_pages(client.get(table_name, **kwargs))
+    records = _iter_records(pages, include_annotations)
+    return list(records) if materialize else records
+
 
-    all_records: List[Dict[str, Any]] = []
-    for page in pages:
-        if include_annotations:
-            all_records.extend(page)
-        else:
-            all_records.extend(strip_annotations(r) for r in page)
-        print(f"  Fetched {len(all_records)} records...", file=sys.stderr)
+def _prefetch_pages(pages: Iterable[Any]) -> Iterator[Any]:
+    """Yield pages while the next one is already being fetched.
 
-    return all_records
+    Dataverse pages by @odata.nextLink, so page N+1 can't be requested before
+    page N arrives; what can overlap is fetching it with processing and
+    printing page N.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    done = object()
+    it = iter(pages)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        future = pool.submit(next, it, done)
+        while True:
+            page = future.result()
+            if page is done:
+                return
+            future = pool.submit(next, it, done)
+            yield page
+
+
+def _iter_records(pages, include_annotations: bool) -> Iterator[Dict[str, Any]]:
+    """Yield records page by page, stripping annotations and reporting progress."""
+    fetched = 0
+    page_count = 0
+    for page_count, page in enumerate(pages, 1):
+        if not include_annotations:
+            # Strip in place: cheaper than rebuilding a dict per record
+            for r in page:
+                for k in [k for k in r if is_odata_annotation(k)]:
+                    del r[k]
+        fetched += len(page)
+        if page_count % 10 == 0:
+            print(f"  Fetched {fetched} records...", file=sys.stderr)
+        yield from page
+
+    if page_count % 10:
+        print(f"  Fetched {fetched} records...", file=sys.stderr)
 
 
 def format_output(records, output_format: str = "json") -> str:
@@ -206,7 +373,7 @@ def format_output(records, output_format: str = "json") -> str:
     Accepts a list of dicts (tabular data) or a single dict/value (JSON only).
     """
     if output_format == "json":
-        return json.dumps(records, indent=2, default=str)
+        return dumps_json(records)
     elif output_format == "table":
         # Wrap single dict in a list for table rendering
         if isinstance(records, dict):
@@ -215,26 +382,44 @@ def format_output(records, output_format: str = "json") -> str:
             return "No records found"
 
         columns = list(records[0].keys())
+        headers = [str(col) for col in columns]
 
-        # Calculate column widths
-        widths = {col: len(str(col)) for col in columns}
-        for record in records:
-            for col in columns:
-                widths[col] = max(widths[col], len(str(record.get(col, ""))))
+        # Stringify each cell once, then derive column widths from the rows
+        rows = [[str(record.get(col, "")) for col in columns] for record in records]
+        widths = [max(len(h), *(len(row[i]) for row in rows)) for i, h in enumerate(headers)]
 
-        lines = []
-        header = " | ".join(str(col).ljust(widths[col]) for col in columns)
-        lines.append(header)
-        lines.append("-+-".join("-" * widths[col] for col in columns))
-        for record in records:
-            row = " | ".join(str(record.get(col, "")).ljust(widths[col]) for col in columns)
-            lines.append(row)
+        lines = [
+            " | ".join(h.ljust(w) for h, w in zip(headers, widths)),
+            "-+-".join("-" * w for w in widths),
+        ]
+        lines.extend(" | ".join(cell.ljust(w) for cell, w in zip(row, widths)) for row in rows)
 
         return "\n".join(lines)
     else:
         return str(records)
 
 
+def print_records(records: Iterable[Dict[str, Any]], output_format: str = "json") -> int:
+    """Print a sequence of records to stdout and return how many were printed.
+
+    JSON output is streamed one record at a time, so generators from
+    query_odata(materialize=False) never have to be held in memory. The table
+    format needs every row to size its columns and is rendered in one go.
+    """
+    if output_format != "json":
+        records = list(records)
+        print(format_output(records, output_format))
+        return len(records)
+
+    out = sys.stdout
+    count = 0
+    for count, record in enumerate(records, 1):
+        out.write("[\n  " if count == 1 else ",\n  ")
+        out.write(dumps_json(record).replace("\n", "\n  "))
+    out.write("\n]\n" if count else "[]\n")
+    return count
+
+
 
 def add_output_args(parser):
     """Add common output arguments to an argparse parser."""
@@ -8,12 +8,16 @@ Provides functions to:
 - Retrieve flow definitions
 """
 
+import functools
 import json
 import sys
-from typing import Any, Dict, List, Optional
-from urllib.request import Request, urlopen
-from urllib.error import HTTPError
-from urllib.parse import urlencode, quote
+import threading
+import time
+import weakref
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlencode, urlparse, quote
+
+from _shared.http import HTTPError, get_json_revalidated, request_json
 
 # CRM region domain → Flow API region prefix
 _CRM_DOMAIN_TO_FLOW_REGION = {
@@ -41,30 +45,73 @@ FLOW_API_RESOURCE = "https://service.flow.microsoft.com"
 BAP_API_RESOURCE = "https://api.bap.microsoft.com"
 FLOW_API_VERSION = "2016-11-01"
 
+# Seconds before a failed or unmatched BAP environment lookup is retried
+_ENV_MISS_TTL = 300
+
+# Upper bound on concurrent Flow API requests when fetching several runs
+_MAX_RUN_WORKERS = 8
+
+# Flow Management API URL templates (static query strings baked in once)
+_FLOW_URL_TPL = "{base}/providers/Microsoft.ProcessSimple/environments/{env}/flows/{flow}"
+_FLOW_DEFINITION_URL_TPL = (
+    _FLOW_URL_TPL + f"?api-version={FLOW_API_VERSION}&$expand=operationDefinition"
+)
+_FLOW_RUNS_URL_TPL = _FLOW_URL_TPL + "/runs?{query}"
+_FLOW_RUN_URL_TPL = (
+    _FLOW_URL_TPL + "/runs/{run}?$expand=properties/actions,properties/flow"
+    f"&api-version={FLOW_API_VERSION}&include=repetitionCount&isMigrationSource=false"
+)
+
+
+# Refresh cached tokens this many seconds before they expire
+_TOKEN_EXPIRY_MARGIN = 60
+
+# credential → {scope: (bearer token, expires_on epoch seconds)}; entries go
+# away with the credential
+_token_cache: "weakref.WeakKeyDictionary[Any, Dict[str, Tuple[str, float]]]" = (
+    weakref.WeakKeyDictionary()
+)
+_token_lock = threading.Lock()
+
+
+def _get_token(credential, scope: str) -> str:
+    """Return a bearer token for scope, reusing it until shortly before expiry."""
+    cached = _token_cache.get(credential, {}).get(scope)
+    if cached and cached[1] - time.time() > _TOKEN_EXPIRY_MARGIN:
+        return cached[0]
+    # Double-checked so concurrent callers trigger a single refresh
+    with _token_lock:
+        cached = _token_cache.get(credential, {}).get(scope)
+        if cached and cached[1] - time.time() > _TOKEN_EXPIRY_MARGIN:
+            return cached[0]
+        token = credential.get_token(scope)
+        _token_cache.setdefault(credential, {})[scope] = (token.token, token.expires_on)
+        return token.token
+
 
 def get_flow_token(credential) -> str:
     """Acquire a token for the Flow Management API."""
-    token = credential.get_token(f"{FLOW_API_RESOURCE}/.default")
-    return token.token
+    return _get_token(credential, f"{FLOW_API_RESOURCE}/.default")
 
 
 def get_bap_token(credential) -> str:
     """Acquire a token for the Business Application Platform API."""
-    token = credential.get_token(f"{BAP_API_RESOURCE}/.default")
-    return token.token
+    return _get_token(credential, f"{BAP_API_RESOURCE}/.default")
 
 
-def _api_get(url: str, token: str) -> Any:
-    """Make an authenticated GET request and return parsed JSON."""
-    req = Request(url, headers={
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/json",
-    })
+def _api_get(url: str, token: str, revalidate: bool = False) -> Any:
+    """Make an authenticated GET request and return parsed JSON.
+
+    With revalidate=True the response is kept in the on-disk ETag cache and
+    later calls send If-None-Match — for data that rarely changes.
+    """
+    headers = {"Authorization": f"Bearer {token}"}
     try:
-        with urlopen(req) as resp:
-            return json.loads(resp.read().decode())
+        if revalidate:
+            return get_json_revalidated(url, headers=headers)
+        return request_json("GET", url, headers=headers)
     except HTTPError as e:
-        body = e.read().decode() if e.fp else ""
+        body = e.read().decode(errors="replace")
         try:
             err = json.loads(body)
             msg = err.get("error", {}).get("message", body)
@@ -77,7 +124,9 @@ def _find_environment(credential, environment_url: str) -> Optional[Dict[str, An
     """Find a BAP environment record matching the given Dataverse URL.
 
     Returns the full environment dict from the BAP API, or None.
-    Result is cached on the credential object to avoid duplicate calls.
+    Result is cached on the credential object to avoid duplicate calls. A miss
+    (no matching environment, or the BAP call failed) is not retried for
+    _ENV_MISS_TTL seconds, since every retry re-lists the whole tenant.
     """
     cache_key = "_bap_env_cache"
     cache = getattr(credential, cache_key, {})
@@ -85,6 +134,9 @@ def _find_environment(credential, environment_url: str) -> Optional[Dict[str, An
 
     if env_url_lower in cache:
         return cache[env_url_lower]
+    listed_at = getattr(credential, "_bap_env_listed_at", None)
+    if listed_at is not None and time.monotonic() - listed_at < _ENV_MISS_TTL:
+        return None
 
     try:
         bap_token = get_bap_token(credential)
@@ -92,6 +144,7 @@ def _find_environment(credential, environment_url: str) -> Optional[Dict[str, An
             f"{BAP_API_RESOURCE}/providers/Microsoft.BusinessAppPlatform"
             f"/scopes/admin/environments?api-version=2020-10-01",
             bap_token,
+            revalidate=True,
         )
         # Cache all discovered environments
         for env in envs.get("value", []):
@@ -99,14 +152,31 @@ def _find_environment(credential, environment_url: str) -> Optional[Dict[str, An
             instance_url = (meta.get("instanceUrl") or "").rstrip("/").lower()
             if instance_url:
                 cache[instance_url] = env
-        setattr(credential, cache_key, cache)
     except Exception as e:
         print(f"  BAP API lookup failed: {e}", file=sys.stderr)
-        setattr(credential, cache_key, cache)
+    setattr(credential, cache_key, cache)
+    setattr(credential, "_bap_env_listed_at", time.monotonic())
 
     return cache.get(env_url_lower)
 
 
+@functools.lru_cache(maxsize=64)
+def _crm_domain_region(environment_url: str) -> Optional[Tuple[str, str]]:
+    """Map an environment URL to its (CRM domain, Flow region), or None."""
+    host = urlparse(environment_url).hostname or ""
+    # Standard hosts are <org>.crmNN.dynamics.com — a direct dict lookup
+    parts = host.split(".")
+    if len(parts) >= 3 and parts[-2:] == ["dynamics", "com"]:
+        domain = ".".join(parts[-3:])
+        region = _CRM_DOMAIN_TO_FLOW_REGION.get(domain)
+        if region:
+            return domain, region
+    for domain, region in _CRM_DOMAIN_TO_FLOW_REGION.items():
+        if host.endswith(domain):
+            return domain, region
+    return None
+
+
 def discover_flow_api_base(credential, environment_url: str) -> str:
     """Discover the regional Flow API base URL for an environment.
 
@@ -123,13 +193,12 @@ def discover_flow_api_base(credential, environment_url: str) -> str:
             return flow_base.rstrip("/")
 
     # CRM domain heuristic fallback
-    from urllib.parse import urlparse
-    host = urlparse(environment_url).hostname or ""
-    for domain, region in _CRM_DOMAIN_TO_FLOW_REGION.items():
-        if host.endswith(domain):
-            base = f"https://{region}.api.flow.microsoft.com"
-            print(f"  Flow API: {base} (heuristic from {domain})", file=sys.stderr)
-            return base
+    match = _crm_domain_region(environment_url)
+    if match:
+        domain, region = match
+        base = f"https://{region}.api.flow.microsoft.com"
+        print(f"  Flow API: {base} (heuristic from {domain})", file=sys.stderr)
+        return base
 
     base = "https://api.flow.microsoft.com"
     print(f"  Flow API: {base} (default fallback)", file=sys.stderr)
@@ -186,18 +255,42 @@ def get_flow_run_with_actions(
     status, error codes, error messages, and input/output links.
     """
     flow_token = get_flow_token(credential)
-    url = (
-        f"{flow_api_base}/providers/Microsoft.ProcessSimple"
-        f"/environments/{environment_id}"
-        f"/flows/{flow_resource_id}"
-        f"/runs/{quote(run_id, safe='')}"
-        f"?$expand=properties/actions,properties/flow"
-        f"&api-version={FLOW_API_VERSION}"
-        f"&include=repetitionCount&isMigrationSource=false"
+    url = _FLOW_RUN_URL_TPL.format(
+        base=flow_api_base, env=environment_id, flow=flow_resource_id,
+        run=quote(run_id, safe=""),
     )
     return _api_get(url, flow_token)
 
 
+def get_flow_runs_with_actions(
+    credential,
+    flow_api_base: str,
+    environment_id: str,
+    flow_resource_id: str,
+    run_ids: List[str],
+    concurrency: int = _MAX_RUN_WORKERS,
+) -> List[Dict[str, Any]]:
+    """Get several flow runs with expanded action details, fetched concurrently.
+
+    The Flow API has no $batch endpoint, so this fans out one GET per run on
+    a bounded thread pool over the shared keep-alive connections. Runs are
+    returned in the order of run_ids.
+    """
+    flow_token = get_flow_token(credential)
+    urls = [
+        _FLOW_RUN_URL_TPL.format(
+            base=flow_api_base, env=environment_id, flow=flow_resource_id,
+            run=quote(run_id, safe=""),
+        )
+        for run_id in run_ids
+    ]
+    if len(urls) <= 1 or concurrency <= 1:
+        return [_api_get(url, flow_token) for url in urls]
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(urls))) as pool:
+        return list(pool.map(lambda url: _api_get(url, flow_token), urls))
+
+
 def list_flow_runs(
     credential,
     flow_api_base: str,
@@ -214,11 +307,9 @@ def list_flow_runs(
     params: Dict[str, str] = {"api-version": FLOW_API_VERSION, "$top": str(top)}
     if status_filter:
         params["$filter"] = f"status eq '{status_filter}'"
-    url = (
-        f"{flow_api_base}/providers/Microsoft.ProcessSimple"
-        f"/environments/{environment_id}"
-        f"/flows/{flow_resource_id}"
-        f"/runs?{urlencode(params)}"
+    url = _FLOW_RUNS_URL_TPL.format(
+        base=flow_api_base, env=environment_id, flow=flow_resource_id,
+        query=urlencode(params),
     )
     data = _api_get(url, flow_token)
     return data.get("value", [])
@@ -236,14 +327,10 @@ def get_flow_definition(
     the Logic Apps workflow JSON.
     """
     flow_token = get_flow_token(credential)
-    url = (
-        f"{flow_api_base}/providers/Microsoft.ProcessSimple"
-        f"/environments/{environment_id}"
-        f"/flows/{flow_resource_id}"
-        f"?api-version={FLOW_API_VERSION}"
-        f"&$expand=operationDefinition"
+    url = _FLOW_DEFINITION_URL_TPL.format(
+        base=flow_api_base, env=environment_id, flow=flow_resource_id,
     )
-    return _api_get(url, flow_token)
+    return _api_get(url, flow_token, revalidate=True)
 
 
 def get_flow_definition_from_dataverse(client, workflow_id: str) -> Optional[Dict[str, Any]]:
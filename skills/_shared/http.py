@@ -0,0 +1,376 @@
+"""Pooled HTTP client for opskit skills — pure Python stdlib, no third-party deps.
+
+urllib.request opens a fresh TCP+TLS connection for every call. Jira and Flow
+helpers paginate against the same few hosts, so this module keeps idle
+http.client connections per host and reuses them (HTTP keep-alive). Responses
+are requested gzip-compressed and decompressed transparently on read.
+
+The pool is module-level, so every helper in the process (Jira, Flow) shares
+it; idle connections are capped per host, so one tenant's pagination never
+evicts another host's connections.
+"""
+
+import base64
+import functools
+import http.client
+import json
+import random
+import sys
+import threading
+import time
+import zlib
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import unquote, urljoin, urlsplit
+
+from _shared import json_io
+
+_TIMEOUT = 30
+_MAX_IDLE_PER_HOST = 8
+_MAX_REDIRECTS = 5
+_REDIRECT_CODES = (301, 302, 303, 307, 308)
+
+# Throttling statuses retried by with_retry()
+_RETRY_STATUSES = (429, 503)
+_MAX_RETRY_DELAY = 60.0
+
+# Errors raised when a pooled connection was closed by the server while idle
+_STALE_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+_PoolKey = Tuple[str, str, int]
+
+_idle: Dict[_PoolKey, List[http.client.HTTPConnection]] = {}
+_idle_lock = threading.Lock()
+
+
+class HTTPError(Exception):
+    """Non-2xx response. The body has already been read into memory."""
+
+    def __init__(self, url: str, code: int, reason: str, headers: Any, body: bytes):
+        super().__init__(f"HTTP {code}: {reason}")
+        self.url = url
+        self.code = code
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+
+    def read(self) -> bytes:
+        return self.body
+
+    @property
+    def retry_after(self) -> Optional[float]:
+        """Seconds the server asked us to wait (Retry-After), if any."""
+        return parse_retry_after(self.headers.get("Retry-After") if self.headers else None)
+
+
+class Response:
+    """A response whose connection returns to the pool once the body is consumed."""
+
+    def __init__(self, key: _PoolKey, conn: http.client.HTTPConnection,
+                 resp: http.client.HTTPResponse, url: str):
+        self._key = key
+        self._conn: Optional[http.client.HTTPConnection] = conn
+        self._resp = resp
+        self.url = url
+        self.status = resp.status
+        self.reason = resp.reason
+        self.headers = resp.headers
+        self._decoder = (
+            zlib.decompressobj(16 + zlib.MAX_WBITS)
+            if resp.headers.get("Content-Encoding", "").lower() == "gzip" else None
+        )
+
+    def read(self, amt: Optional[int] = None) -> bytes:
+        if self._decoder is not None:
+            data = self._read_decoded(amt)
+        else:
+            data = self._resp.read() if amt is None else self._resp.read(amt)
+        if self._resp.isclosed():
+            self.close()
+        return data
+
+    def _read_decoded(self, amt: Optional[int]) -> bytes:
+        if amt is None:
+            return self._decoder.decompress(self._resp.read()) + self._decoder.flush()
+        # A compressed chunk can decode to nothing; keep reading so that an
+        # empty result still means end of body
+        while True:
+            chunk = self._resp.read(amt)
+            if not chunk:
+                return self._decoder.flush()
+            data = self._decoder.decompress(chunk)
+            if data:
+                return data
+
+    def close(self) -> None:
+        conn, self._conn = self._conn, None
+        if conn is None:
+            return
+        # Only a fully-read response leaves the connection in a reusable state
+        if self._resp.isclosed() and not self._resp.will_close:
+            _checkin(self._key, conn)
+        else:
+            self._resp.close()
+            conn.close()
+
+    def __enter__(self) -> "Response":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+# ---------------------------------------------------------------------------
+# Connection pool
+# ---------------------------------------------------------------------------
+
+
+@functools.lru_cache(maxsize=None)
+def _tls_context():
+    """One SSLContext for all HTTPS connections.
+
+    HTTPSConnection otherwise builds a fresh context per connection, loading
+    the system CA store each time.
+    """
+    import ssl
+    return ssl.create_default_context()
+
+
+def _new_connection(key: _PoolKey, timeout: float) -> http.client.HTTPConnection:
+    """Open a connection to key's host, tunnelling through HTTP(S)_PROXY if set."""
+    from urllib.request import getproxies, proxy_bypass
+
+    scheme, host, port = key
+    if scheme == "https":
+        conn_cls = functools.partial(http.client.HTTPSConnection, context=_tls_context())
+    else:
+        conn_cls = http.client.HTTPConnection
+
+    proxy = getproxies().get(scheme)
+    if not proxy or proxy_bypass(host):
+        return conn_cls(host, port, timeout=timeout)
+
+    proxy_parts = urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+    conn = conn_cls(proxy_parts.hostname, proxy_parts.port or 8080, timeout=timeout)
+    tunnel_headers = {}
+    if proxy_parts.username:
+        creds = f"{unquote(proxy_parts.username)}:{unquote(proxy_parts.password or '')}"
+        tunnel_headers["Proxy-Authorization"] = "Basic " + base64.b64encode(creds.encode()).decode()
+    conn.set_tunnel(host, port, headers=tunnel_headers)
+    return conn
+
+
+def _checkout(key: _PoolKey, timeout: float) -> Tuple[http.client.HTTPConnection, bool]:
+    """Return (connection, reused) — an idle pooled connection if one exists."""
+    with _idle_lock:
+        conns = _idle.get(key)
+        if conns:
+            return conns.pop(), True
+    return _new_connection(key, timeout), False
+
+
+def _checkin(key: _PoolKey, conn: http.client.HTTPConnection) -> None:
+    with _idle_lock:
+        conns = _idle.setdefault(key, [])
+        if len(conns) < _MAX_IDLE_PER_HOST:
+            conns.append(conn)
+            return
+    conn.close()
+
+
+def _send(method: str, url: str, headers: Dict[str, str], body: Optional[bytes],
+          timeout: float) -> Response:
+    parts = urlsplit(url)
+    scheme = parts.scheme or "https"
+    key = (scheme, parts.hostname or "", parts.port or (443 if scheme == "https" else 80))
+    target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+
+    conn, reused = _checkout(key, timeout)
+    while True:
+        try:
+            conn.request(method, target, body=body, headers=headers)
+            return Response(key, conn, conn.getresponse(), url)
+        except _STALE_ERRORS:
+            conn.close()
+            if not reused:
+                raise
+            # The server dropped an idle keep-alive connection; retry on a fresh one
+            conn, reused = _new_connection(key, timeout), False
+        except Exception:
+            conn.close()
+            raise
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+
+def request(
+    method: str,
+    url: str,
+    *,
+    headers: Optional[Dict[str, str]] = None,
+    body: Optional[bytes] = None,
+    json_body: Any = None,
+    timeout: float = _TIMEOUT,
+) -> Response:
+    """
+    Send a request over a pooled keep-alive connection.
+
+    json_body, if given, is serialized as the request body with a JSON
+    Content-Type. Asks for gzip unless the caller set Accept-Encoding, follows
+    redirects (dropping Authorization when the host changes) and raises
+    HTTPError for 4xx/5xx responses. Use the returned Response as a context
+    manager, or read it to the end, so its connection goes back to the pool.
+    """
+    headers = dict(headers or {})
+    if json_body is not None:
+        body = json.dumps(json_body).encode("utf-8")
+        headers.setdefault("Content-Type", "application/json")
+    headers.setdefault("Accept-Encoding", "gzip")
+    for _ in range(_MAX_REDIRECTS + 1):
+        resp = _send(method, url, headers, body, timeout)
+
+        location = resp.headers.get("Location")
+        if resp.status in _REDIRECT_CODES and location:
+            resp.read()
+            new_url = urljoin(url, location)
+            if urlsplit(new_url).netloc != urlsplit(url).netloc:
+                headers.pop("Authorization", None)
+            if resp.status == 303 or (resp.status in (301, 302) and method == "POST"):
+                method, body = "GET", None
+                headers.pop("Content-Type", None)
+            url = new_url
+            continue
+
+        if resp.status >= 400:
+            data = resp.read()
+            raise HTTPError(url, resp.status, resp.reason, resp.headers, data)
+        return resp
+
+    resp.close()
+    raise HTTPError(url, resp.status, "Too many redirects", resp.headers, b"")
+
+
+def request_json(
+    method: str,
+    url: str,
+    *,
+    headers: Optional[Dict[str, str]] = None,
+    json_body: Any = None,
+    timeout: float = _TIMEOUT,
+) -> Any:
+    """Send a request (see request()) and return the parsed JSON response body."""
+    headers = dict(headers or {})
+    headers.setdefault("Accept", "application/json")
+    with request(method, url, headers=headers, json_body=json_body, timeout=timeout) as resp:
+        return json_io.load(resp)
+
+
+def get_json_revalidated(
+    url: str,
+    *,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: float = _TIMEOUT,
+) -> Any:
+    """
+    GET JSON through the on-disk ETag cache (see _shared.http_cache).
+
+    A cached copy is revalidated with If-None-Match; on 304 Not Modified the
+    cached body is returned without transferring it again. Responses carrying
+    an ETag are stored for the next call.
+    """
+    from _shared import http_cache
+
+    headers = dict(headers or {})
+    headers.setdefault("Accept", "application/json")
+    cached = http_cache.lookup(url, headers)
+    if cached:
+        headers["If-None-Match"] = cached[0]
+
+    with request("GET", url, headers=headers, timeout=timeout) as resp:
+        if resp.status == 304 and cached:
+            resp.read()
+            return cached[1]
+        data = json_io.load(resp)
+        etag = resp.headers.get("ETag")
+    if etag:
+        http_cache.store(url, headers, etag, data)
+    return data
+
+
+def get_revalidated(
+    url: str,
+    *,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: float = _TIMEOUT,
+) -> bytes:
+    """
+    GET a raw body through the on-disk ETag cache (see _shared.http_cache).
+
+    Like get_json_revalidated(), but for non-JSON content such as file
+    downloads: the body is cached as bytes, one cache file per URL.
+    """
+    from _shared import http_cache
+
+    headers = dict(headers or {})
+    cached = http_cache.lookup_blob(url, headers)
+    if cached:
+        headers["If-None-Match"] = cached[0]
+
+    with request("GET", url, headers=headers, timeout=timeout) as resp:
+        if resp.status == 304 and cached:
+            resp.read()
+            return cached[1]
+        data = resp.read()
+        etag = resp.headers.get("ETag")
+    if etag:
+        http_cache.store_blob(url, headers, etag, data)
+    return data
+
+
+# ---------------------------------------------------------------------------
+# Throttling
+# ---------------------------------------------------------------------------
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds or as an HTTP-date."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    from email.utils import parsedate_to_datetime
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def with_retry(
+    call: Callable[[], Any],
+    *,
+    errors: Tuple[type, ...] = (HTTPError,),
+    max_retries: int = 3,
+) -> Any:
+    """
+    Run call(), retrying throttled requests (429/503) and honouring Retry-After.
+
+    errors are the exception types to inspect; each needs .code and
+    .retry_after (seconds or None), like HTTPError. Without Retry-After the
+    wait backs off exponentially (1s, 2s, 4s, ... plus jitter), capped at 60s.
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            return call()
+        except errors as e:
+            if e.code not in _RETRY_STATUSES or attempt == max_retries:
+                raise
+            retry_after = e.retry_after
+            if retry_after is None:
+                retry_after = 2.0 ** attempt + random.uniform(0, 1)
+            delay = min(retry_after, _MAX_RETRY_DELAY)
+            print(f"  HTTP {e.code}, retrying in {delay:.1f}s...", file=sys.stderr)
+            time.sleep(delay)
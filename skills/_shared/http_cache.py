@@ -0,0 +1,131 @@
+"""Persistent ETag cache for rarely-changing API responses — stdlib only.
+
+Each entry is its own file under <plugin root>/.cache/http/, named by the
+SHA-256 of the caller's identity and the URL, so storing one response never
+rewrites the others and one account's responses are never replayed to
+another. The identity is the tenant/object ID of a bearer JWT, or a hash of
+any other Authorization header. Parsed JSON entries are stored as
+{"etag": ..., "body": ...} (<key>.json), raw bodies as "<etag>\\n<body>"
+(<key>.bin). Callers always revalidate with If-None-Match, so a stale entry
+costs one 304 round-trip, never a wrong answer. Caching is best-effort: an
+unreadable or unwritable cache file is ignored.
+"""
+
+import base64
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from _shared import json_io
+
+CACHE_DIR = Path(__file__).resolve().parents[2] / ".cache" / "http"
+
+# Least recently used entries are evicted beyond this many files
+_MAX_ENTRIES = 256
+
+
+def _identity(headers: Dict[str, str]) -> str:
+    """Who the request is made as, derived from its Authorization header."""
+    auth = headers.get("Authorization", "")
+    if not auth:
+        return ""
+    scheme, _, token = auth.partition(" ")
+    if scheme.lower() == "bearer" and token.count(".") == 2:
+        # Tokens rotate hourly; key on the stable subject instead
+        try:
+            payload = token.split(".")[1]
+            claims = json_io.loads(base64.urlsafe_b64decode(payload + "=="))
+            subject = claims.get("oid") or claims.get("sub")
+            if subject:
+                return f"{claims.get('tid', '')}/{subject}"
+        except (ValueError, AttributeError):
+            pass
+    return hashlib.sha256(auth.encode()).hexdigest()
+
+
+def _entry_path(url: str, headers: Dict[str, str], suffix: str) -> Path:
+    key = hashlib.sha256(f"{_identity(headers)}\n{url}".encode()).hexdigest()
+    return CACHE_DIR / f"{key}{suffix}"
+
+
+def _read(path: Path) -> Optional[bytes]:
+    try:
+        data = path.read_bytes()
+        os.utime(path)  # mark as recently used for eviction
+    except OSError:
+        return None
+    return data
+
+
+def _write_private(path: Path, data: bytes) -> None:
+    """Atomically replace path with data, readable by the owner only."""
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except OSError:
+        return
+    _evict()
+
+
+def _evict() -> None:
+    """Delete the least recently used entries beyond _MAX_ENTRIES (stat only, no reads)."""
+    try:
+        with os.scandir(CACHE_DIR) as it:
+            entries = [(e.stat().st_mtime, e.path) for e in it
+                       if e.is_file() and not e.name.endswith(".tmp")]
+    except OSError:
+        return
+    excess = len(entries) - _MAX_ENTRIES
+    if excess <= 0:
+        return
+    entries.sort()
+    for _mtime, old in entries[:excess]:
+        try:
+            os.unlink(old)
+        except OSError:
+            pass
+
+
+def lookup(url: str, headers: Dict[str, str]) -> Optional[Tuple[str, Any]]:
+    """Return (etag, parsed body) cached for url as this identity, or None."""
+    data = _read(_entry_path(url, headers, ".json"))
+    if data is None:
+        return None
+    try:
+        entry = json_io.loads(data)
+    except ValueError:
+        return None
+    if not isinstance(entry, dict) or not entry.get("etag"):
+        return None
+    return entry["etag"], entry.get("body")
+
+
+def store(url: str, headers: Dict[str, str], etag: str, body: Any) -> None:
+    """Cache a parsed response body under url for this identity."""
+    payload = json.dumps({"etag": etag, "body": body}, separators=(",", ":"))
+    _write_private(_entry_path(url, headers, ".json"), payload.encode())
+
+
+def lookup_blob(url: str, headers: Dict[str, str]) -> Optional[Tuple[str, bytes]]:
+    """Return (etag, raw body) cached for url as this identity, or None."""
+    data = _read(_entry_path(url, headers, ".bin"))
+    if data is None:
+        return None
+    etag, sep, body = data.partition(b"\n")
+    if not sep or not etag:
+        return None
+    return etag.decode("utf-8", errors="replace"), body
+
+
+def store_blob(url: str, headers: Dict[str, str], etag: str, body: bytes) -> None:
+    """Cache a raw response body under url for this identity, stored as "<etag>\\n<body>"."""
+    if "\n" in etag:
+        return
+    _write_private(_entry_path(url, headers, ".bin"), etag.encode() + b"\n" + body)
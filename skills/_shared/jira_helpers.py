@@ -1,14 +1,16 @@
 """Shared Jira helpers for opskit skills — pure Python stdlib, no third-party deps."""
 
 import base64
+import functools
 import json
 import os
 import sys
-import urllib.error
 import urllib.parse
-import urllib.request
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from _shared import json_io
+from _shared.http import HTTPError, request, request_json, with_retry
 
 
 # ---------------------------------------------------------------------------
@@ -16,6 +18,17 @@ from typing import Any, Dict, List, Optional, Tuple
 # ---------------------------------------------------------------------------
 
 
+class JiraHTTPError(RuntimeError):
+    """Jira REST API error response, with Retry-After seconds when throttled."""
+
+    def __init__(self, code: int, message: str, retry_after: Optional[float] = None):
+        super().__init__(f"HTTP {code}: {message}")
+        self.code = code
+        self.message = message
+        self.retry_after = retry_after
+
+
+@functools.lru_cache(maxsize=16)
 def _auth_header(email: str, api_token: str) -> str:
     raw = f"{email}:{api_token}"
     return "Basic " + base64.b64encode(raw.encode()).decode()
@@ -36,7 +49,9 @@ def jira_request(
     """
     Make an authenticated request to the Jira REST API.
 
-    Returns parsed JSON by default, or the raw HTTPResponse if raw_response=True.
+    Returns parsed JSON by default, or the raw pooled Response if raw_response=True
+    (read it to the end or close it to return the connection to the pool).
+    Raises JiraHTTPError for error responses.
     """
     url = server.rstrip("/") + path
     if params:
@@ -45,19 +60,16 @@ def jira_request(
         if filtered:
             url += "?" + urllib.parse.urlencode(filtered)
 
-    data = None
-    if body is not None:
-        data = json.dumps(body).encode("utf-8")
-
-    req = urllib.request.Request(url, data=data, method=method)
-    req.add_header("Authorization", _auth_header(email, api_token))
-    req.add_header("Accept", accept)
-    if data is not None:
-        req.add_header("Content-Type", "application/json")
+    headers = {
+        "Authorization": _auth_header(email, api_token),
+        "Accept": accept,
+    }
 
     try:
-        resp = urllib.request.urlopen(req)
-    except urllib.error.HTTPError as e:
+        if raw_response:
+            return request(method, url, headers=headers, json_body=body)
+        return request_json(method, url, headers=headers, json_body=body)
+    except HTTPError as e:
         error_body = e.read().decode("utf-8", errors="replace")
         try:
             error_json = json.loads(error_body)
@@ -66,19 +78,30 @@ def jira_request(
                 msg = "; ".join(msg) if msg else error_body
         except (json.JSONDecodeError, KeyError):
             msg = error_body
-        print(f"HTTP {e.code}: {msg}", file=sys.stderr)
-        sys.exit(1)
-
-    if raw_response:
-        return resp
-
-    return json.loads(resp.read().decode("utf-8"))
+        raise JiraHTTPError(e.code, msg, e.retry_after) from e
 
 
 # ---------------------------------------------------------------------------
 # Pagination helpers
 # ---------------------------------------------------------------------------
 
+# Upper bound on concurrent page requests per Jira tenant
+_MAX_PAGE_WORKERS = 8
+
+# Throttled (429/503) page requests are retried up to this many times
+_MAX_RETRIES = 4
+
+_with_retry = functools.partial(with_retry, errors=(JiraHTTPError,), max_retries=_MAX_RETRIES)
+
+
+def _fetch_pages(fetch: Callable[[int], Any], offsets: List[int]) -> List[Any]:
+    """Call fetch(offset) for each offset on a bounded thread pool, preserving order."""
+    if len(offsets) <= 1:
+        return [fetch(offset) for offset in offsets]
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=min(_MAX_PAGE_WORKERS, len(offsets))) as pool:
+        return list(pool.map(fetch, offsets))
+
 
 def search_issues_paginated(
     server: str,
@@ -91,7 +114,9 @@ def search_issues_paginated(
     """
     Search issues using JQL with automatic pagination.
 
-    Uses POST /rest/api/3/search/jql (current endpoint).
+    Uses POST /rest/api/3/search/jql (current endpoint). Pages are chained by
+    nextPageToken, so each request depends on the previous response and they
+    are fetched sequentially.
     """
     all_issues: List[Dict[str, Any]] = []
     next_page_token: Optional[str] = None
@@ -106,14 +131,14 @@ def search_issues_paginated(
         if next_page_token:
             body["nextPageToken"] = next_page_token
 
-        result = jira_request(
+        result = _with_retry(lambda: jira_request(
             server,
             "/rest/api/3/search/jql",
             email=email,
             api_token=api_token,
             method="POST",
             body=body,
-        )
+        ))
 
         issues = result.get("issues", [])
         all_issues.extend(issues)
@@ -134,27 +159,78 @@ def servicedesk_paginated(
     path: str,
     values_key: str = "values",
 ) -> List[Dict[str, Any]]:
-    """Paginate through a JSM Service Desk API endpoint."""
-    all_values: List[Dict[str, Any]] = []
-    start = 0
+    """
+    Paginate through a JSM Service Desk API endpoint.
+
+    The API reports no total, only isLastPage. After the first page, the next
+    pages are requested speculatively in parallel (window doubling up to
+    _MAX_PAGE_WORKERS) and consumed in order until the last page is seen.
+    """
     limit = 50
 
-    while True:
-        result = jira_request(
+    def fetch(start: int) -> Dict[str, Any]:
+        return _with_retry(lambda: jira_request(
             server,
             path,
             email=email,
             api_token=api_token,
             params={"start": start, "limit": limit},
-        )
+        ))
+
+    result = fetch(0)
+    values = result.get(values_key, [])
+    all_values: List[Dict[str, Any]] = list(values)
+    page_size = len(values)
+    start = page_size
+    window = 1
+
+    while values and not result.get("isLastPage", True):
+        window = min(window * 2, _MAX_PAGE_WORKERS)
+        offsets = [start + i * page_size for i in range(window)]
+        for result in _fetch_pages(fetch, offsets):
+            values = result.get(values_key, [])
+            all_values.extend(values)
+            start += len(values)
+            # A short page shifts every later offset; resume from the true start
+            if result.get("isLastPage", True) or len(values) != page_size:
+                break
 
-        values = result.get(values_key, [])
-        all_values.extend(values)
+    return all_values
 
-        if result.get("isLastPage", True) or not values:
-            break
-        start += len(values)
 
+def offset_paginated(
+    server: str,
+    email: str,
+    api_token: str,
+    path: str,
+    values_key: str,
+    page_size: int = 100,
+    params: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Paginate a startAt/maxResults endpoint that reports a total (e.g. issue comments).
+
+    The first page reveals the total; the remaining pages are then fetched in
+    parallel and concatenated in order.
+    """
+    def fetch(start_at: int) -> Dict[str, Any]:
+        return _with_retry(lambda: jira_request(
+            server,
+            path,
+            email=email,
+            api_token=api_token,
+            params={**(params or {}), "startAt": start_at, "maxResults": page_size},
+        ))
+
+    first = fetch(0)
+    all_values: List[Dict[str, Any]] = list(first.get(values_key, []))
+    step = len(all_values)
+    total = first.get("total", 0)
+    if not step or step >= total:
+        return all_values
+
+    for page in _fetch_pages(fetch, list(range(step, total, step))):
+        all_values.extend(page.get(values_key, []))
     return all_values
 
 
@@ -163,83 +239,118 @@ def servicedesk_paginated(
 # ---------------------------------------------------------------------------
 
 
-def adf_to_text(node: Any) -> str:
-    """
-    Convert an Atlassian Document Format node to plain text.
+# Work-stack opcodes for adf_to_text
+_VISIT, _EMIT, _MARK, _STRIP = range(4)
 
-    Handles common node types: paragraph, text, heading, bulletList,
-    orderedList, listItem, codeBlock, blockquote, hardBreak, mention,
-    mediaGroup, mediaSingle, table, tableRow, tableCell, tableHeader.
-    """
-    if node is None:
-        return ""
-    if isinstance(node, str):
-        return node
 
-    if not isinstance(node, dict):
-        return ""
+def _adf_children(node: Dict[str, Any]) -> List[Tuple[int, Any]]:
+    return [(_VISIT, child) for child in node.get("content") or []]
 
-    node_type = node.get("type", "")
-    text = node.get("text", "")
-    content = node.get("content", [])
 
-    if node_type == "text":
-        return text
+def _adf_paragraph(node: Dict[str, Any]) -> List[Tuple[int, Any]]:
+    return _adf_children(node) + [(_EMIT, "\n")]
 
-    if node_type == "hardBreak":
-        return "\n"
 
-    if node_type == "mention":
-        return node.get("attrs", {}).get("text", "@unknown")
+def _adf_heading(node: Dict[str, Any]) -> List[Tuple[int, Any]]:
+    level = node.get("attrs", {}).get("level", 1)
+    return [(_EMIT, "#" * level + " ")] + _adf_children(node) + [(_EMIT, "\n")]
 
-    if node_type == "emoji":
-        return node.get("attrs", {}).get("shortName", "")
 
-    # Recurse into children
-    children_text = "".join(adf_to_text(child) for child in content)
+def _adf_code_block(node: Dict[str, Any]) -> List[Tuple[int, Any]]:
+    lang = node.get("attrs", {}).get("language", "")
+    return [(_EMIT, f"```{lang}\n")] + _adf_children(node) + [(_EMIT, "```\n")]
 
-    if node_type == "doc":
-        return children_text
 
-    if node_type in ("paragraph", "blockquote"):
-        return children_text + "\n"
+def _adf_list(node: Dict[str, Any]) -> List[Tuple[int, Any]]:
+    ordered = node.get("type") == "orderedList"
+    ops: List[Tuple[int, Any]] = []
+    for i, item in enumerate(node.get("content") or []):
+        if i:
+            ops.append((_EMIT, "\n"))
+        ops.append((_EMIT, f"{i + 1}. " if ordered else "- "))
+        ops += [(_MARK, None), (_VISIT, item), (_STRIP, None)]
+    ops.append((_EMIT, "\n"))
+    return ops
 
-    if node_type == "heading":
-        level = node.get("attrs", {}).get("level", 1)
-        return "#" * level + " " + children_text + "\n"
 
-    if node_type in ("bulletList", "orderedList"):
-        lines = []
-        for i, item in enumerate(content):
-            prefix = f"{i + 1}. " if node_type == "orderedList" else "- "
-            item_text = adf_to_text(item).strip()
-            lines.append(prefix + item_text)
-        return "\n".join(lines) + "\n"
+def _adf_table(node: Dict[str, Any]) -> List[Tuple[int, Any]]:
+    ops: List[Tuple[int, Any]] = []
+    for r, row in enumerate(node.get("content") or []):
+        if r:
+            ops.append((_EMIT, "\n"))
+        for c, cell in enumerate(row.get("content") or []):
+            if c:
+                ops.append((_EMIT, " | "))
+            ops += [(_MARK, None), (_VISIT, cell), (_STRIP, None)]
+    ops.append((_EMIT, "\n"))
+    return ops
 
-    if node_type == "listItem":
-        return children_text
 
-    if node_type == "codeBlock":
-        lang = node.get("attrs", {}).get("language", "")
-        return f"```{lang}\n{children_text}```\n"
+def _adf_media(node: Dict[str, Any]) -> List[Tuple[int, Any]]:
+    return [(_EMIT, "[attachment]\n")]
 
-    if node_type in ("mediaSingle", "mediaGroup"):
-        return "[attachment]\n"
 
-    if node_type == "table":
-        rows = []
-        for row in content:
-            cells = []
-            for cell in row.get("content", []):
-                cells.append(adf_to_text(cell).strip())
-            rows.append(" | ".join(cells))
-        return "\n".join(rows) + "\n"
+# Leaf node type → text
+_ADF_LEAVES: Dict[str, Callable[[Dict[str, Any]], str]] = {
+    "text": lambda n: n.get("text", ""),
+    "hardBreak": lambda n: "\n",
+    "mention": lambda n: n.get("attrs", {}).get("text", "@unknown"),
+    "emoji": lambda n: n.get("attrs", {}).get("shortName", ""),
+}
 
-    if node_type in ("tableRow", "tableHeader", "tableCell"):
-        return children_text
+# Container node type → ops (in output order); unknown types emit their children
+_ADF_BLOCKS: Dict[str, Callable[[Dict[str, Any]], List[Tuple[int, Any]]]] = {
+    "paragraph": _adf_paragraph,
+    "blockquote": _adf_paragraph,
+    "heading": _adf_heading,
+    "codeBlock": _adf_code_block,
+    "bulletList": _adf_list,
+    "orderedList": _adf_list,
+    "mediaSingle": _adf_media,
+    "mediaGroup": _adf_media,
+    "table": _adf_table,
+}
 
-    # Fallback: just return children text
-    return children_text
+
+def adf_to_text(node: Any) -> str:
+    """
+    Convert an Atlassian Document Format node to plain text.
+
+    Handles common node types: paragraph, text, heading, bulletList,
+    orderedList, listItem, codeBlock, blockquote, hardBreak, mention,
+    mediaGroup, mediaSingle, table, tableRow, tableCell, tableHeader.
+
+    Walks the tree with an explicit work stack and appends to a single output
+    buffer, so deep documents cost neither recursion nor per-level joins.
+    List items and table cells are stripped via _MARK/_STRIP around their text.
+    """
+    out: List[str] = []
+    marks: List[int] = []
+    stack: List[Tuple[int, Any]] = [(_VISIT, node)]
+    # Bound methods hoisted out of the loop — it runs once per node and op
+    emit, push, pop = out.append, stack.extend, stack.pop
+    leaves_get, blocks_get = _ADF_LEAVES.get, _ADF_BLOCKS.get
+
+    while stack:
+        op, arg = pop()
+        if op == _EMIT:
+            emit(arg)
+        elif op == _MARK:
+            marks.append(len(out))
+        elif op == _STRIP:
+            start = marks.pop()
+            out[start:] = ["".join(out[start:]).strip()]
+        elif isinstance(arg, dict):
+            node_type = arg.get("type", "")
+            leaf = leaves_get(node_type)
+            if leaf:
+                emit(leaf(arg))
+                continue
+            push(reversed(blocks_get(node_type, _adf_children)(arg)))
+        elif isinstance(arg, str):
+            emit(arg)
+
+    return "".join(out)
 
 
 # ---------------------------------------------------------------------------
@@ -247,10 +358,21 @@ def adf_to_text(node: Any) -> str:
 # ---------------------------------------------------------------------------
 
 
+# Longer table cells are truncated with "..."
+_TABLE_CELL_MAX = 80
+
+
+def _table_cell(val: Any) -> str:
+    """Stringify a value for table display, truncating long text."""
+    # Most Jira fields are already str; skip the str() call for them
+    text = val if type(val) is str else str(val)
+    return text if len(text) <= _TABLE_CELL_MAX else text[:_TABLE_CELL_MAX - 3] + "..."
+
+
 def format_output(records: Any, output_format: str = "json") -> str:
     """Format results as JSON or table."""
     if output_format == "json":
-        return json.dumps(records, indent=2, default=str)
+        return json_io.dumps(records)
 
     if output_format == "table":
         if isinstance(records, dict):
@@ -259,27 +381,16 @@ def format_output(records: Any, output_format: str = "json") -> str:
             return "No records found"
 
         columns = list(records[0].keys())
-        widths = {col: len(str(col)) for col in columns}
-        for record in records:
-            for col in columns:
-                val = str(record.get(col, ""))
-                # Truncate long values for table display
-                if len(val) > 80:
-                    val = val[:77] + "..."
-                widths[col] = max(widths[col], len(val))
-
-        lines = []
-        header = " | ".join(str(col).ljust(widths[col]) for col in columns)
-        lines.append(header)
-        lines.append("-+-".join("-" * widths[col] for col in columns))
-        for record in records:
-            row_parts = []
-            for col in columns:
-                val = str(record.get(col, ""))
-                if len(val) > 80:
-                    val = val[:77] + "..."
-                row_parts.append(val.ljust(widths[col]))
-            lines.append(" | ".join(row_parts))
+        headers = [str(col) for col in columns]
+
+        # Stringify and truncate each cell once, then derive widths from the rows
+        rows = [[_table_cell(record.get(col, "")) for col in columns] for record in records]
+        widths = [max(len(h), *(len(row[i]) for row in rows)) for i, h in enumerate(headers)]
+
+        # One precomputed template pads a whole row per call instead of per-cell ljust
+        row_fmt = " | ".join(f"{{:<{w}}}" for w in widths)
+        lines = [row_fmt.format(*headers), "-+-".join("-" * w for w in widths)]
+        lines.extend(row_fmt.format(*row) for row in rows)
         return "\n".join(lines)
 
     return str(records)
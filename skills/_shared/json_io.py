@@ -0,0 +1,41 @@
+"""JSON encode/decode for opskit skills — orjson when installed, stdlib json otherwise.
+
+orjson is listed in requirements.txt for the venv, but the stdlib-only scripts
+(Jira, preflight) run on the system interpreter and must work without it.
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Datetimes go through default=str so output matches stdlib json.dumps
+_DUMPS_OPTIONS = (
+    orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+    if orjson is not None else 0
+)
+
+
+def dumps(obj: Any) -> str:
+    """Serialize obj as 2-space indented JSON, stringifying unknown types."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=_DUMPS_OPTIONS, default=str).decode()
+        except TypeError:
+            pass  # a value orjson can't encode (e.g. >64-bit int)
+    return json.dumps(obj, indent=2, default=str)
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Parse JSON from bytes or str. Raises json.JSONDecodeError on bad input."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def load(fp) -> Any:
+    """Parse JSON from a binary file-like object (e.g. an HTTP response)."""
+    return loads(fp.read())
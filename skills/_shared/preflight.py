@@ -1,13 +1,14 @@
 """Provider preflight checks and config management — stdlib only (runs before venv)."""
 
-import json
+import functools
 import os
-import shutil
-import subprocess
 import sys
+import threading
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+from _shared import json_io
 
 
 # ---------------------------------------------------------------------------
@@ -32,14 +33,14 @@ def _workspace_config_path() -> Path:
 # ---------------------------------------------------------------------------
 
 
-@dataclass
+@dataclass(slots=True)
 class Check:
     name: str
     passed: bool
     detail: str
 
 
-@dataclass
+@dataclass(slots=True)
 class ProviderStatus:
     name: str
     ready: bool
@@ -52,47 +53,94 @@ class ProviderStatus:
 # ---------------------------------------------------------------------------
 
 
+# str(path) → ((st_mtime_ns, st_size), parsed JSON) for config files read so far
+_json_cache: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+
+
+def load_json(path: Path) -> Optional[Any]:
+    """Parse a JSON config file, re-reading it only when it changed on disk.
+
+    Returns None if the file does not exist. The parsed value is shared with
+    the cache; callers that modify it must write it back with the matching
+    save_* function.
+    """
+    key = str(path)
+    cached = _json_cache.get(key)
+    try:
+        if cached is not None:
+            # Cache hit costs a single stat() — no open/read/parse
+            st = os.stat(key)
+            if (st.st_mtime_ns, st.st_size) == cached[0]:
+                return cached[1]
+        with open(key, "rb") as f:
+            # Stamp from the open descriptor so it matches the bytes parsed
+            st = os.fstat(f.fileno())
+            data = json_io.load(f)
+    except FileNotFoundError:
+        _json_cache.pop(key, None)
+        return None
+    _json_cache[key] = ((st.st_mtime_ns, st.st_size), data)
+    return data
+
+
 def load_config() -> Dict[str, Any]:
-    if CONFIG_PATH.exists():
-        with open(CONFIG_PATH, "r") as f:
-            return json.load(f)
-    return {"defaults": {}}
+    data = load_json(CONFIG_PATH)
+    return data if data is not None else {"defaults": {}}
+
+
+def save_json(path: Path, data: Any, mode: int = 0o666) -> None:
+    """Write data as JSON atomically: temp file in the same directory, then rename.
+
+    A crash mid-write never leaves a truncated file behind. mode applies to the
+    temp file from creation (subject to umask), so a restrictive mode means the
+    content is never briefly readable by others.
+    """
+    # Unique per writer, so concurrent saves never rename each other's partial file
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    payload = json_io.dumps(data).encode("utf-8")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        if mode != 0o666:
+            try:
+                os.chmod(tmp, mode)  # O_CREAT mode doesn't apply to a leftover tmp file
+            except OSError:
+                pass
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    _json_cache.pop(str(path), None)
+    _status_cache.clear()
 
 
 def save_config(data: Dict[str, Any]) -> None:
-    with open(CONFIG_PATH, "w") as f:
-        json.dump(data, f, indent=2)
+    save_json(CONFIG_PATH, data)
 
 
 def load_connections() -> Dict[str, Any]:
-    if CONNECTIONS_PATH.exists():
-        with open(CONNECTIONS_PATH, "r") as f:
-            return json.load(f)
-    return {}
+    data = load_json(CONNECTIONS_PATH)
+    return data if data is not None else {}
 
 
 def save_connections(data: Dict[str, Any]) -> None:
-    with open(CONNECTIONS_PATH, "w") as f:
-        json.dump(data, f, indent=2)
-    try:
-        os.chmod(CONNECTIONS_PATH, 0o600)
-    except OSError:
-        pass
+    """Write connections.json owner-readable only (it holds secrets)."""
+    save_json(CONNECTIONS_PATH, data, mode=0o600)
 
 
 def load_workspace() -> Dict[str, Any]:
-    path = _workspace_config_path()
-    if path.exists():
-        with open(path, "r") as f:
-            return json.load(f)
-    return {}
+    data = load_json(_workspace_config_path())
+    return data if data is not None else {}
 
 
 def save_workspace(data: Dict[str, Any]) -> None:
     path = _workspace_config_path()
     path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w") as f:
-        json.dump(data, f, indent=2)
+    save_json(path, data)
 
 
 # ---------------------------------------------------------------------------
@@ -100,6 +148,14 @@ def save_workspace(data: Dict[str, Any]) -> None:
 # ---------------------------------------------------------------------------
 
 
+# connection key → environment variable fallback for Jira
+_JIRA_ENV_VARS = (
+    ("server", "JIRA_SERVER"),
+    ("email", "JIRA_EMAIL"),
+    ("api_token", "JIRA_API_TOKEN"),
+)
+
+
 def resolve_connection(provider: str, cli_overrides: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
     """
     Resolve the effective connection for a provider.
@@ -110,38 +166,35 @@ def resolve_connection(provider: str, cli_overrides: Optional[Dict[str, str]] =
     3. Global defaults (config.json — default connection → connections.json)
     4. Environment variables (JIRA_SERVER, JIRA_EMAIL, JIRA_API_TOKEN)
     """
-    connections = load_connections()
     workspace = load_workspace()
-    config = load_config()
 
     # Determine which named connection to use
     conn_name = (
-        workspace.get("connections", {}).get(provider)
-        or config.get("defaults", {}).get(provider)
+        (workspace.get("connections") or {}).get(provider)
+        or (load_config().get("defaults") or {}).get(provider)
     )
 
-    conn = {}
+    # Copy: the loaded dicts are cached and must not pick up env/CLI values
+    conn: Dict[str, Any] = {}
     if conn_name:
-        conn = connections.get(provider, {}).get(conn_name, {})
+        conn = {**((load_connections().get(provider) or {}).get(conn_name) or {})}
 
     # Workspace-level environment_url applies to dataverse
-    if provider == "dataverse" and workspace.get("environment_url"):
-        conn.setdefault("environment_url", workspace["environment_url"])
+    if provider == "dataverse":
+        env_url = workspace.get("environment_url")
+        if env_url:
+            conn.setdefault("environment_url", env_url)
 
     # Env var fallbacks (Jira only — ADO/Dataverse use Azure CLI)
-    if provider == "jira":
-        if not conn.get("server"):
-            conn["server"] = os.environ.get("JIRA_SERVER", "")
-        if not conn.get("email"):
-            conn["email"] = os.environ.get("JIRA_EMAIL", "")
-        if not conn.get("api_token"):
-            conn["api_token"] = os.environ.get("JIRA_API_TOKEN", "")
+    elif provider == "jira":
+        environ = os.environ
+        for key, var in _JIRA_ENV_VARS:
+            if not conn.get(key):
+                conn[key] = environ.get(var, "")
 
     # CLI overrides always win
     if cli_overrides:
-        for k, v in cli_overrides.items():
-            if v:
-                conn[k] = v
+        conn.update((k, v) for k, v in cli_overrides.items() if v)
 
     return conn
 
@@ -151,33 +204,88 @@ def resolve_connection(provider: str, cli_overrides: Optional[Dict[str, str]] =
 # ---------------------------------------------------------------------------
 
 
+def _probe_once(fn):
+    """Cache a zero-argument probe for the life of the process.
+
+    Provider checks run concurrently and share probes (ado and dataverse both
+    need the az login state); the lock makes concurrent first callers wait
+    for a single run instead of each spawning az.
+    """
+    lock = threading.Lock()
+    result: List[Any] = []
+
+    @functools.wraps(fn)
+    def wrapper():
+        with lock:
+            if not result:
+                result.append(fn())
+            return result[0]
+
+    wrapper.cache_clear = result.clear
+    return wrapper
+
+
+def az_config_dir() -> Path:
+    """Azure CLI state directory (AZURE_CONFIG_DIR, default ~/.azure)."""
+    return Path(os.environ.get("AZURE_CONFIG_DIR") or Path.home() / ".azure")
+
+
+@_probe_once
 def _az_cli_available() -> bool:
+    import shutil
     return shutil.which("az") is not None
 
 
+@_probe_once
 def _az_logged_in() -> Optional[str]:
     """Check if Azure CLI is logged in. Returns account name or None."""
     if not _az_cli_available():
         return None
+    # az login records accounts in azureProfile.json, which is exactly what
+    # 'az account show' reads — parse it directly and skip the CLI startup
+    try:
+        raw = (az_config_dir() / "azureProfile.json").read_bytes()
+    except FileNotFoundError:
+        return None
+    except OSError:
+        raw = None
+    if raw is not None:
+        try:
+            profile = json_io.loads(raw.decode("utf-8-sig"))  # az writes a BOM
+            default = next((sub for sub in profile["subscriptions"] if sub.get("isDefault")), None)
+            if default is None:
+                return None
+            return (default.get("user") or {}).get("name") or None
+        except (ValueError, KeyError, TypeError, AttributeError):
+            pass  # unexpected format; let az answer
+    import subprocess
     try:
         result = subprocess.run(
             ["az", "account", "show", "--query", "user.name", "-o", "tsv"],
-            capture_output=True, text=True, timeout=10,
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, timeout=10,
         )
-        if result.returncode == 0 and result.stdout.strip():
-            return result.stdout.strip()
+        user = result.stdout.decode("utf-8", "replace").strip() if result.returncode == 0 else ""
+        if user:
+            return user
     except (subprocess.TimeoutExpired, FileNotFoundError):
         pass
     return None
 
 
+@_probe_once
 def _az_devops_extension_installed() -> bool:
     if not _az_cli_available():
         return False
+    # User extensions live in AZURE_EXTENSION_DIR (default <config dir>/cliextensions);
+    # ask az only if it isn't there (e.g. a system-wide install)
+    ext_dir = os.environ.get("AZURE_EXTENSION_DIR") or az_config_dir() / "cliextensions"
+    if (Path(ext_dir) / "azure-devops").is_dir():
+        return True
+    import subprocess
     try:
         result = subprocess.run(
             ["az", "extension", "show", "--name", "azure-devops", "-o", "json"],
-            capture_output=True, text=True, timeout=10,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=10,
         )
         return result.returncode == 0
     except (subprocess.TimeoutExpired, FileNotFoundError):
@@ -197,15 +305,47 @@ def _venv_python() -> Optional[Path]:
     return p if p.exists() else None
 
 
+# Package directories the Dataverse scripts import, relative to site-packages
+_DATAVERSE_PACKAGE_DIRS = (Path("azure", "identity"), Path("PowerPlatform", "Dataverse"))
+
+
+def _venv_site_packages() -> List[Path]:
+    if sys.platform == "win32":
+        return [VENV_DIR / "Lib" / "site-packages"]
+    # The venv's Python version may differ from the one running preflight
+    return list(VENV_DIR.glob("lib/python3*/site-packages"))
+
+
+@_probe_once
 def _venv_has_packages() -> bool:
-    """Check if required Dataverse packages are importable from the venv."""
+    """Check if required Dataverse packages are importable from the venv.
+
+    Looks for the package directories in site-packages first. If that
+    doesn't find them (unusual layout, or genuinely missing), asks the import
+    system directly when already running in the venv (the Dataverse scripts
+    re-exec into it), and only otherwise spawns the venv interpreter to try
+    the imports.
+    """
     vpy = _venv_python()
     if not vpy:
         return False
+    for site_packages in _venv_site_packages():
+        if all((site_packages / pkg).is_dir() for pkg in _DATAVERSE_PACKAGE_DIRS):
+            return True
+    if Path(sys.prefix).resolve() == VENV_DIR.resolve():
+        import importlib.util
+        try:
+            return all(
+                importlib.util.find_spec(".".join(pkg.parts)) is not None
+                for pkg in _DATAVERSE_PACKAGE_DIRS
+            )
+        except (ImportError, ValueError):
+            return False
+    import subprocess
     try:
         result = subprocess.run(
             [str(vpy), "-c", "import azure.identity; import PowerPlatform.Dataverse"],
-            capture_output=True, text=True, timeout=10,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=10,
         )
         return result.returncode == 0
     except (subprocess.TimeoutExpired, FileNotFoundError):
@@ -217,6 +357,20 @@ def _venv_has_packages() -> bool:
 # ---------------------------------------------------------------------------
 
 
+# Setup hints are static apart from step numbering; build the fixed parts once
+_BOOTSTRAP = f"python3 {PLUGIN_ROOT}/scripts/bootstrap.py"
+_JIRA_INSTRUCTIONS = "\n".join([
+    "To configure Jira:",
+    f"  {_BOOTSTRAP} add-connection jira <name>",
+    "",
+    "Or set environment variables:",
+    "  JIRA_SERVER=https://yourcompany.atlassian.net",
+    "  JIRA_EMAIL=you@company.com",
+    "  JIRA_API_TOKEN=<token>",
+    f"  Create a token at: {_TOKEN_CREATE_URL}",
+])
+
+
 def check_jira() -> ProviderStatus:
     conn = resolve_connection("jira")
     checks = []
@@ -243,17 +397,7 @@ def check_jira() -> ProviderStatus:
     ))
 
     ready = has_server and has_email and has_token
-    instructions = ""
-    if not ready:
-        lines = ["To configure Jira:"]
-        lines.append(f"  python3 {PLUGIN_ROOT}/scripts/bootstrap.py add-connection jira <name>")
-        lines.append("")
-        lines.append("Or set environment variables:")
-        lines.append("  JIRA_SERVER=https://yourcompany.atlassian.net")
-        lines.append("  JIRA_EMAIL=you@company.com")
-        lines.append("  JIRA_API_TOKEN=<token>")
-        lines.append(f"  Create a token at: {_TOKEN_CREATE_URL}")
-        instructions = "\n".join(lines)
+    instructions = "" if ready else _JIRA_INSTRUCTIONS
 
     return ProviderStatus("jira", ready, checks, instructions)
 
@@ -261,36 +405,48 @@ def check_jira() -> ProviderStatus:
 def check_ado() -> ProviderStatus:
     conn = resolve_connection("ado")
     checks = []
-
+    has_org = bool(conn.get("organization"))
+    has_project = bool(conn.get("project"))
     az_found = _az_cli_available()
+
+    # Without any ADO connection the provider can't be ready whatever az says,
+    # so don't pay two az startups (~0.5s+ each) to find out
+    probe_az = az_found and (has_org or has_project)
+    ext_ok, az_user = False, None
+    if probe_az:
+        # The two az probes each start the CLI; run them side by side
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            user_future = pool.submit(_az_logged_in)
+            ext_ok = _az_devops_extension_installed()
+            az_user = user_future.result()
+
     checks.append(Check(
         "Azure CLI",
         az_found,
         "installed" if az_found else "not found",
     ))
 
-    ext_ok = _az_devops_extension_installed()
-    checks.append(Check(
-        "azure-devops extension",
-        ext_ok,
-        "installed" if ext_ok else "not installed",
-    ))
+    # Checks that never ran are left out rather than reported as failures
+    if probe_az:
+        checks.append(Check(
+            "azure-devops extension",
+            ext_ok,
+            "installed" if ext_ok else "not installed",
+        ))
 
-    az_user = _az_logged_in()
-    checks.append(Check(
-        "Azure CLI login",
-        az_user is not None,
-        az_user or "not logged in",
-    ))
+        checks.append(Check(
+            "Azure CLI login",
+            az_user is not None,
+            az_user or "not logged in",
+        ))
 
-    has_org = bool(conn.get("organization"))
     checks.append(Check(
         "Organization",
         has_org,
         conn.get("organization", "not configured"),
     ))
 
-    has_project = bool(conn.get("project"))
     checks.append(Check(
         "Project",
         has_project,
@@ -305,14 +461,14 @@ def check_ado() -> ProviderStatus:
         if not az_found:
             lines.append(f"  {step}. Install Azure CLI: https://aka.ms/install-azure-cli")
             step += 1
-        if not ext_ok:
+        if probe_az and not ext_ok:
             lines.append(f"  {step}. az extension add --name azure-devops")
             step += 1
-        if not az_user:
+        if probe_az and not az_user:
             lines.append(f"  {step}. az login")
             step += 1
         if not has_org or not has_project:
-            lines.append(f"  {step}. python3 {PLUGIN_ROOT}/scripts/bootstrap.py add-connection ado <name>")
+            lines.append(f"  {step}. {_BOOTSTRAP} add-connection ado <name>")
         instructions = "\n".join(lines)
 
     return ProviderStatus("ado", ready, checks, instructions)
@@ -322,21 +478,26 @@ def check_dataverse() -> ProviderStatus:
     conn = resolve_connection("dataverse")
     checks = []
 
-    vpy = _venv_python()
+    # Package import check and az login each spawn a process; overlap them
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        user_future = pool.submit(_az_logged_in)
+        vpy = _venv_python()
+        pkgs = _venv_has_packages()
+        az_user = user_future.result()
+
     checks.append(Check(
         "Virtual environment",
         vpy is not None,
         str(vpy) if vpy else "not created",
     ))
 
-    pkgs = _venv_has_packages()
     checks.append(Check(
         "Dataverse packages",
         pkgs,
         "installed" if pkgs else "missing (azure-identity, PowerPlatform-Dataverse-Client)",
     ))
 
-    az_user = _az_logged_in()
     checks.append(Check(
         "Azure CLI login",
         az_user is not None,
@@ -364,13 +525,13 @@ def check_dataverse() -> ProviderStatus:
         lines = ["To configure Dataverse:"]
         step = 1
         if not vpy or not pkgs:
-            lines.append(f"  {step}. python3 {PLUGIN_ROOT}/scripts/bootstrap.py setup")
+            lines.append(f"  {step}. {_BOOTSTRAP} setup")
             step += 1
         if not az_user:
             lines.append(f"  {step}. az login")
             step += 1
         if not has_tenant:
-            lines.append(f"  {step}. python3 {PLUGIN_ROOT}/scripts/bootstrap.py add-connection dataverse <name>")
+            lines.append(f"  {step}. {_BOOTSTRAP} add-connection dataverse <name>")
         instructions = "\n".join(lines)
 
     return ProviderStatus("dataverse", ready, checks, instructions)
@@ -383,15 +544,27 @@ _PROVIDER_CHECKS = {
 }
 
 
+# Provider name → last check result; cleared whenever a config file is saved
+_status_cache: Dict[str, ProviderStatus] = {}
+
+
 def check_provider(name: str) -> ProviderStatus:
+    status = _status_cache.get(name)
+    if status is not None:
+        return status
     fn = _PROVIDER_CHECKS.get(name)
     if not fn:
         return ProviderStatus(name, False, [], f"Unknown provider: {name}")
-    return fn()
+    status = _status_cache[name] = fn()
+    return status
 
 
 def check_all() -> Dict[str, ProviderStatus]:
-    return {name: fn() for name, fn in _PROVIDER_CHECKS.items()}
+    """Run every provider check concurrently (they wait on subprocesses, not CPU)."""
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=len(_PROVIDER_CHECKS)) as pool:
+        futures = {name: pool.submit(check_provider, name) for name in _PROVIDER_CHECKS}
+        return {name: future.result() for name, future in futures.items()}
 
 
 # ---------------------------------------------------------------------------
@@ -442,14 +615,15 @@ def print_status_json(statuses: Dict[str, ProviderStatus]) -> None:
     ws = load_workspace()
     if ws:
         data["_workspace"] = ws
-    print(json.dumps(data, indent=2))
+    print(json_io.dumps(data))
 
 
 def print_status(statuses: Dict[str, ProviderStatus], fmt: str = "text") -> None:
     if fmt == "json":
         print_status_json(statuses)
         return
-    print("=== OpsKit Provider Status ===\n")
+    # Collect every line and write once rather than print() per line
+    out = ["=== OpsKit Provider Status ===", ""]
     for name, status in statuses.items():
         label = _PROVIDER_LABELS.get(name, name)
         mark = "✓" if status.ready else "✗"
@@ -464,29 +638,28 @@ def print_status(statuses: Dict[str, ProviderStatus], fmt: str = "text") -> None
         line = f"{mark} {label:<16} {state}"
         if summary and status.ready:
             line += f" ({summary})"
-        print(line)
+        out.append(line)
 
         if not status.ready:
-            for check in status.checks:
-                if not check.passed:
-                    print(f"    ✗ {check.name}: {check.detail}")
+            out.extend(f"    ✗ {check.name}: {check.detail}" for check in status.checks if not check.passed)
             if status.instructions:
-                for inst_line in status.instructions.split("\n"):
-                    print(f"    {inst_line}")
-        print()
+                out.extend(f"    {inst_line}" for inst_line in status.instructions.split("\n"))
+        out.append("")
 
     # Workspace info
     ws = load_workspace()
     if ws:
-        print("--- Workspace (ops/opskit.json) ---")
+        out.append("--- Workspace (ops/opskit.json) ---")
         if ws.get("environment_url"):
-            print(f"  Environment URL: {ws['environment_url']}")
+            out.append(f"  Environment URL: {ws['environment_url']}")
         ws_conns = ws.get("connections", {})
         if ws_conns:
-            for prov, cname in ws_conns.items():
-                print(f"  {prov} connection: {cname}")
-        print()
+            out.extend(f"  {prov} connection: {cname}" for prov, cname in ws_conns.items())
+        out.append("")
     else:
-        print("--- Workspace ---")
-        print("  No ops/opskit.json found in current directory.")
-        print("  Create one to set environment URL and connection overrides.\n")
+        out.append("--- Workspace ---")
+        out.append("  No ops/opskit.json found in current directory.")
+        out.append("  Create one to set environment URL and connection overrides.")
+        out.append("")
+
+    sys.stdout.write("\n".join(out) + "\n")
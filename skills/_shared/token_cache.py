@@ -0,0 +1,62 @@
+"""On-disk cache of Azure CLI access tokens shared by opskit skills — stdlib only.
+
+Tokens obtained through `az login` (directly via `az account get-access-token`
+or through azure-identity's AzureCliCredential) are valid for about an hour,
+but every fetch spawns the az CLI. Caching them in <plugin root>/.cache/tokens.json
+(mode 0600) lets later invocations skip that. Entries are stamped with the
+mtime of azureProfile.json, so `az login`/`az logout` invalidates them all.
+Caching is best-effort: an unreadable or unwritable cache file is ignored.
+"""
+
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from _shared.preflight import PLUGIN_ROOT, az_config_dir, load_json, save_json
+
+TOKEN_CACHE_PATH = PLUGIN_ROOT / ".cache" / "tokens.json"
+
+# Cached tokens are refreshed this many seconds before they expire
+_EXPIRY_MARGIN = 60
+
+# key → {"token", "expires_at", "stamp"} for tokens seen in this process
+_memory: Dict[str, Dict[str, Any]] = {}
+
+
+def _login_stamp() -> int:
+    """mtime of azureProfile.json — `az login`/`az logout` rewrite it."""
+    try:
+        return (az_config_dir() / "azureProfile.json").stat().st_mtime_ns
+    except OSError:
+        return 0
+
+
+def _load() -> Dict[str, Dict[str, Any]]:
+    """Cached tokens by key; shared with preflight's config cache, so don't mutate."""
+    try:
+        entries = load_json(TOKEN_CACHE_PATH)
+    except (OSError, ValueError):
+        return {}
+    return entries if isinstance(entries, dict) else {}
+
+
+def lookup(key: str) -> Optional[Tuple[str, float]]:
+    """Return (token, expires_at epoch seconds) if a still-valid token is cached."""
+    entry = _memory.get(key)
+    if entry is None:
+        entry = _load().get(key)
+    if (isinstance(entry, dict) and entry.get("stamp") == _login_stamp()
+            and entry.get("expires_at", 0) - _EXPIRY_MARGIN > time.time()):
+        _memory[key] = entry
+        return entry["token"], entry["expires_at"]
+    return None
+
+
+def store(key: str, token: str, expires_at: float) -> None:
+    """Remember a token in memory and persist it for later invocations."""
+    entry = {"token": token, "expires_at": expires_at, "stamp": _login_stamp()}
+    _memory[key] = entry
+    try:
+        TOKEN_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        save_json(TOKEN_CACHE_PATH, {**_load(), key: entry}, mode=0o600)
+    except OSError:
+        pass
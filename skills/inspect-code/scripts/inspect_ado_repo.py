@@ -1,129 +1,102 @@
 #!/usr/bin/env python3
 """Inspect Azure DevOps repositories — list repos, search code, get file contents, git history.
 
-Uses the `az devops` CLI for Git operations and the Azure DevOps Search REST API
-for code search. Authentication is via `az login` (interactive).
+Uses the Azure DevOps Git and Search REST APIs via _shared.ado_helpers.
+Authentication is via `az login` (interactive).
 """
 
 import argparse
-import json
-import os
-import subprocess
 import sys
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-from urllib.error import HTTPError
-from urllib.parse import quote
-from urllib.request import Request, urlopen
+from typing import Any, Dict, List, Optional, Tuple
 
 # Add skills/ to path for shared module imports
 sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from _shared import json_io
+from _shared.ado_helpers import (
+    AdoContext,
+    fetch_file,
+    fetch_files,
+    fetch_history,
+    fetch_repos,
+    fetch_search,
+    get_access_token,
+    stream_file,
+)
+from _shared.http import HTTPError
 from _shared.preflight import require_provider
 
+# Upper bound on concurrent requests for batch and multi-file fetches
+_MAX_BATCH_WORKERS = 8
+
 
 # ---------------------------------------------------------------------------
-# Azure CLI helpers
+# Git operations via REST API
 # ---------------------------------------------------------------------------
 
 
-def _run_az(args_list: List[str], check: bool = True) -> str:
-    """Run an az CLI command and return stdout."""
-    cmd = ["az"] + args_list + ["--output", "json"]
-    print(f"  $ {' '.join(cmd)}", file=sys.stderr)
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    if check and result.returncode != 0:
-        # Strip the pkg_resources deprecation warning from stderr
-        err = "\n".join(
-            line for line in result.stderr.splitlines()
-            if "pkg_resources" not in line and "UserWarning" not in line
-        ).strip()
-        print(f"az CLI error: {err}", file=sys.stderr)
-        sys.exit(1)
-    return result.stdout.strip()
-
-
-def _get_access_token(resource: str = "499b84ac-1321-427f-aa17-267ca6975798") -> str:
-    """Get an access token for Azure DevOps via `az account get-access-token`."""
-    out = _run_az(["account", "get-access-token", "--resource", resource, "--query", "accessToken", "-o", "tsv"])
-    # -o tsv already strips quotes, but --output json was appended; parse accordingly
-    token = out.strip().strip('"')
-    return token
-
-
-def _get_access_token_raw() -> str:
-    """Get a raw access token for Azure DevOps Search API."""
-    result = subprocess.run(
-        ["az", "account", "get-access-token",
-         "--resource", "499b84ac-1321-427f-aa17-267ca6975798",
-         "--query", "accessToken", "-o", "tsv"],
-        capture_output=True, text=True,
-    )
-    if result.returncode != 0:
-        print(f"Failed to get access token: {result.stderr.strip()}", file=sys.stderr)
+def list_repos(ctx: AdoContext, name_filter: Optional[str] = None, top: Optional[int] = None):
+    try:
+        results = fetch_repos(ctx, name_filter=name_filter, top=top)
+    except HTTPError as e:
+        print(f"API error ({e.code}): {e.read().decode()}", file=sys.stderr)
         sys.exit(1)
-    return result.stdout.strip()
-
-
-# ---------------------------------------------------------------------------
-# Git operations via az CLI
-# ---------------------------------------------------------------------------
-
 
-def list_repos(org: str, project: str):
-    out = _run_az(["repos", "list", "--org", org, "--project", project])
-    repos = json.loads(out)
-    results = [
-        {
-            "name": r["name"],
-            "id": r["id"],
-            "default_branch": r.get("defaultBranch", ""),
-            "web_url": r.get("webUrl", ""),
-        }
-        for r in repos
-    ]
-    print(json.dumps(results, indent=2, default=str))
+    print(json_io.dumps(results))
     print(f"\n--- {len(results)} repository(ies) ---", file=sys.stderr)
 
 
-def list_files(org: str, project: str, repo: str, path: str):
-    """List files/directories at a path using the Git Items REST API."""
-    token = _get_access_token_raw()
-    org_name = org.rstrip("/").split("/")[-1]
-    url = (
-        f"https://dev.azure.com/{quote(org_name)}/{quote(project)}"
-        f"/_apis/git/repositories/{quote(repo)}"
-        f"/items?scopePath={quote(path)}&recursionLevel=OneLevel&api-version=7.1"
-    )
-    req = Request(url, headers={"Authorization": f"Bearer {token}", "Accept": "application/json"})
+def list_files(ctx: AdoContext, repo: str, path: str, revalidate: bool = True,
+               recursion: str = "OneLevel", prefetch: bool = False, cache_files: bool = False):
     try:
-        with urlopen(req) as resp:
-            data = json.loads(resp.read().decode())
+        results = fetch_files(ctx, repo, path, revalidate=revalidate, recursion=recursion)
     except HTTPError as e:
         print(f"API error ({e.code}): {e.read().decode()}", file=sys.stderr)
         sys.exit(1)
 
-    items = data.get("value", [])
-    results = [{"path": i["path"], "is_folder": i.get("isFolder", False)} for i in items]
-    print(json.dumps(results, indent=2, default=str))
+    if prefetch:
+        # Print the listed files' contents instead of the listing itself
+        get_files(ctx, repo, [r["path"] for r in results if not r["is_folder"]],
+                  revalidate=cache_files)
+        return
+
+    print(json_io.dumps(results))
     print(f"\n--- {len(results)} item(s) ---", file=sys.stderr)
 
 
-def get_file(org: str, project: str, repo: str, path: str):
-    """Get file contents using the Git Items REST API."""
-    token = _get_access_token_raw()
-    org_name = org.rstrip("/").split("/")[-1]
-    url = (
-        f"https://dev.azure.com/{quote(org_name)}/{quote(project)}"
-        f"/_apis/git/repositories/{quote(repo)}"
-        f"/items?path={quote(path)}&api-version=7.1"
-    )
-    req = Request(url, headers={"Authorization": f"Bearer {token}", "Accept": "application/octet-stream"})
+def get_file(ctx: AdoContext, repo: str, path: str, revalidate: bool = False):
+    sys.stdout.flush()
     try:
-        with urlopen(req) as resp:
-            print(resp.read().decode("utf-8", errors="replace"))
+        stream_file(ctx, repo, path, sys.stdout.buffer, revalidate=revalidate)
     except HTTPError as e:
         print(f"API error ({e.code}): {e.read().decode()}", file=sys.stderr)
         sys.exit(1)
+    sys.stdout.buffer.write(b"\n")
+
+
+def get_files(ctx: AdoContext, repo: str, paths: List[str], revalidate: bool = False):
+    """Fetch several files concurrently and print them as one {path: content} object."""
+    get_access_token()  # warm the token cache before fanning out
+
+    def fetch(path: str) -> Tuple[str, Optional[str], Optional[str]]:
+        try:
+            return path, fetch_file(ctx, repo, path, revalidate=revalidate), None
+        except HTTPError as e:
+            return path, None, f"API error ({e.code}): {e.read().decode(errors='replace')}"
+
+    workers = max(1, min(_MAX_BATCH_WORKERS, len(paths)))
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        fetched = list(pool.map(fetch, paths))
+
+    contents = {path: content for path, content, err in fetched if err is None}
+    print(json_io.dumps(contents))
+    print(f"\n--- {len(contents)} of {len(paths)} file(s) ---", file=sys.stderr)
+    errors = [(path, err) for path, _, err in fetched if err is not None]
+    for path, err in errors:
+        print(f"{path}: {err}", file=sys.stderr)
+    if errors:
+        sys.exit(1)
 
 
 # ---------------------------------------------------------------------------
@@ -131,74 +104,25 @@ def get_file(org: str, project: str, repo: str, path: str):
 # ---------------------------------------------------------------------------
 
 
-def search_code(org: str, project: str, query: str,
+def search_code(ctx: AdoContext, query: str,
                 repo_filter: Optional[str] = None,
                 path_filter: Optional[str] = None,
                 extension_filter: Optional[str] = None,
                 top: int = 25):
-    """Search code using the Azure DevOps Search REST API."""
-    token = _get_access_token_raw()
-    org_name = org.rstrip("/").split("/")[-1]
-    url = (
-        f"https://almsearch.dev.azure.com/{quote(org_name)}"
-        f"/{quote(project)}/_apis/search/codesearchresults?api-version=7.1"
-    )
-
-    filters: Dict[str, List[str]] = {}
-    if repo_filter:
-        filters["Repository"] = [repo_filter]
-    # Path and CodeElement filters require Repository filter in the API,
-    # so we use inline search syntax (path:, ext:) instead of filter objects
-    # when no repository is specified.
-    if repo_filter:
-        if path_filter:
-            filters["Path"] = [path_filter]
-        if extension_filter:
-            filters["CodeElement"] = [extension_filter]
-
-    # Build search text with inline filters for path/extension
-    search_text = query
-    if path_filter and "path:" not in query:
-        search_text += f" path:{path_filter}"
-    if extension_filter and "ext:" not in query:
-        search_text += f" ext:{extension_filter}"
-
-    body = json.dumps({
-        "searchText": search_text,
-        "$top": top,
-        "$skip": 0,
-        "filters": filters if filters else {},
-    }).encode()
-
-    print(f"  Searching: {search_text}", file=sys.stderr)
-    req = Request(url, data=body, method="POST", headers={
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/json",
-        "Content-Type": "application/json",
-    })
     try:
-        with urlopen(req) as resp:
-            data = json.loads(resp.read().decode())
+        results, count = fetch_search(
+            ctx, query,
+            repo_filter=repo_filter,
+            path_filter=path_filter,
+            extension_filter=extension_filter,
+            top=top,
+        )
     except HTTPError as e:
         err_body = e.read().decode()
         print(f"Search API error ({e.code}): {err_body}", file=sys.stderr)
         sys.exit(1)
 
-    results = []
-    for r in data.get("results", []):
-        results.append({
-            "repository": r.get("repository", {}).get("name", ""),
-            "path": r.get("path", ""),
-            "filename": r.get("fileName", ""),
-            "project": r.get("project", {}).get("name", ""),
-            "matches": [
-                {"content": h.get("content", ""), "charOffset": h.get("charOffset", 0)}
-                for h in r.get("matches", {}).get("content", [])
-            ] if r.get("matches") else [],
-        })
-
-    print(json.dumps(results, indent=2, default=str))
-    count = data.get("count", len(results))
+    print(json_io.dumps(results))
     print(f"\n--- {len(results)} result(s) shown, {count} total ---", file=sys.stderr)
 
 
@@ -207,43 +131,92 @@ def search_code(org: str, project: str, query: str,
 # ---------------------------------------------------------------------------
 
 
-def git_history(org: str, project: str, repo: str, path: Optional[str] = None, top: int = 10):
-    """Show recent commits for a file or repo using the Git Commits REST API."""
-    token = _get_access_token_raw()
-    org_name = org.rstrip("/").split("/")[-1]
-    url = (
-        f"https://dev.azure.com/{quote(org_name)}/{quote(project)}"
-        f"/_apis/git/repositories/{quote(repo)}"
-        f"/commits?$top={top}&api-version=7.1"
-    )
-    if path:
-        url += f"&searchCriteria.itemPath={quote(path)}"
-
-    req = Request(url, headers={"Authorization": f"Bearer {token}", "Accept": "application/json"})
+def git_history(ctx: AdoContext, repo: str, path: Optional[str] = None, top: int = 10):
     try:
-        with urlopen(req) as resp:
-            data = json.loads(resp.read().decode())
+        results = fetch_history(ctx, repo, path=path, top=top)
     except HTTPError as e:
         print(f"API error ({e.code}): {e.read().decode()}", file=sys.stderr)
         sys.exit(1)
 
-    commits = data.get("value", [])
-    results = []
-    for c in commits:
-        author = c.get("author", {})
-        results.append({
-            "commitId": c.get("commitId", "")[:12],
-            "author": author.get("name", ""),
-            "date": author.get("date", ""),
-            "message": c.get("comment", "").strip(),
-            "url": c.get("remoteUrl", ""),
-        })
-
-    print(json.dumps(results, indent=2, default=str))
+    print(json_io.dumps(results))
     target = f"'{path}'" if path else repo
     print(f"\n--- {len(results)} commit(s) for {target} ---", file=sys.stderr)
 
 
+# ---------------------------------------------------------------------------
+# Batch: several REST actions in one invocation
+# ---------------------------------------------------------------------------
+
+# Actions accepted in a batch, with the fields each one requires
+_BATCH_REQUIRED = {
+    "list-files": ("repo",),
+    "get-file": ("repo", "path"),
+    "search": ("query",),
+    "git-history": ("repo",),
+}
+
+
+def _run_batch_op(ctx: AdoContext, op: Dict[str, Any], revalidate: bool,
+                  cache_files: bool) -> Any:
+    action = op["action"]
+    if action == "list-files":
+        return fetch_files(ctx, op["repo"], op.get("path") or "/", revalidate=revalidate,
+                           recursion=op.get("recursion") or "OneLevel")
+    if action == "get-file":
+        return fetch_file(ctx, op["repo"], op["path"], revalidate=cache_files)
+    if action == "search":
+        results, count = fetch_search(
+            ctx, op["query"],
+            repo_filter=op.get("repo_filter"),
+            path_filter=op.get("path_filter"),
+            extension_filter=op.get("extension_filter"),
+            top=op.get("top", 25),
+        )
+        return {"results": results, "count": count}
+    path = op.get("path")
+    return fetch_history(ctx, op["repo"], path=path if path != "/" else None,
+                         top=op.get("top", 10))
+
+
+def run_batch(ctx: AdoContext, ops: List[Dict[str, Any]], revalidate: bool = True,
+              cache_files: bool = False):
+    """
+    Run several list-files/get-file/search/git-history actions concurrently.
+
+    Prints a JSON array with one {"action", "result"} or {"action", "error"}
+    entry per op, in input order. One failing op does not abort the others.
+    """
+    for i, op in enumerate(ops):
+        if not isinstance(op, dict) or op.get("action") not in _BATCH_REQUIRED:
+            print(f"Error: batch op {i} needs an action from: "
+                  f"{', '.join(_BATCH_REQUIRED)}", file=sys.stderr)
+            sys.exit(1)
+        missing = [f for f in _BATCH_REQUIRED[op["action"]] if not op.get(f)]
+        if missing:
+            print(f"Error: batch op {i} ({op['action']}) is missing: {', '.join(missing)}",
+                  file=sys.stderr)
+            sys.exit(1)
+
+    # Fetch the token once up front so the workers don't each spawn az
+    get_access_token()
+
+    def run(op: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            return {"action": op["action"], "result": _run_batch_op(ctx, op, revalidate, cache_files)}
+        except HTTPError as e:
+            return {"action": op["action"],
+                    "error": f"API error ({e.code}): {e.read().decode(errors='replace')}"}
+
+    workers = max(1, min(_MAX_BATCH_WORKERS, len(ops)))
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(run, ops))
+
+    print(json_io.dumps(results))
+    failed = sum(1 for r in results if "error" in r)
+    print(f"\n--- {len(results)} op(s), {failed} failed ---", file=sys.stderr)
+
+
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
@@ -261,31 +234,76 @@ Examples:
   # List repositories
   %(prog)s --action list-repos
 
+  # List the first 10 repositories whose name contains "flows"
+  %(prog)s --action list-repos --filter flows --top 10
+
   # List files in a directory
   %(prog)s --action list-files --repo MyRepo --path "/src"
 
+  # Get the contents of every file under a directory
+  %(prog)s --action list-files --repo MyRepo --path "/workflows" --recursion Full --prefetch
+
   # Get file contents
   %(prog)s --action get-file --repo MyRepo --path "/workflows/flow.json"
 
+  # Get several files at once
+  %(prog)s --action get-files --repo MyRepo --paths "/workflows/a.json" "/workflows/b.json"
+
+  # Get every file listed in paths.txt (one path per line)
+  %(prog)s --action get-files --repo MyRepo --paths-from-file paths.txt
+
   # View recent commits for a file
   %(prog)s --action git-history --repo MyRepo --path "/workflows/flow.json" --top 10
+
+  # Run several actions concurrently (JSON list of ops on stdin)
+  echo '[{"action": "get-file", "repo": "MyRepo", "path": "/a.json"},
+        {"action": "git-history", "repo": "MyRepo", "path": "/a.json"}]' | %(prog)s --action batch
         """,
     )
 
     parser.add_argument("--organization", help="Azure DevOps organization URL (overrides connection)")
     parser.add_argument("--project", help="Project name (overrides connection)")
-    parser.add_argument("--repo", help="Repository name (required for list-files, get-file, git-history)")
+    parser.add_argument("--repo", help="Repository name (required for list-files, get-file, get-files, git-history)")
     parser.add_argument(
         "--action", required=True,
-        choices=["list-repos", "list-files", "get-file", "search", "git-history"],
+        choices=["list-repos", "list-files", "get-file", "get-files", "search", "git-history", "batch"],
         help="Action to perform",
     )
     parser.add_argument("--path", default="/", help="File or directory path")
+    parser.add_argument("--paths", nargs="+", default=[], help="File paths for get-files")
+    parser.add_argument(
+        "--paths-from-file", metavar="FILE",
+        help="get-files: read additional paths from FILE, one per line ('-' for stdin)",
+    )
+    parser.add_argument(
+        "--recursion", choices=["OneLevel", "Full"], default="OneLevel",
+        help="list-files depth: direct children (default) or the whole subtree",
+    )
+    parser.add_argument(
+        "--prefetch", action="store_true",
+        help="list-files: fetch the listed files concurrently and print {path: content}",
+    )
     parser.add_argument("--query", help="Search query string")
     parser.add_argument("--repo-filter", help="Filter search results to a specific repository")
     parser.add_argument("--path-filter", help="Filter search results by path (e.g., 'workflows')")
     parser.add_argument("--extension-filter", help="Filter search results by file extension (e.g., 'json')")
-    parser.add_argument("--top", type=int, default=25, help="Maximum results to return (default: 25)")
+    parser.add_argument(
+        "--filter", metavar="TEXT",
+        help="list-repos: only repositories whose name contains TEXT (case-insensitive)",
+    )
+    parser.add_argument(
+        "--top", type=int,
+        help="Maximum results to return (default: 25; all repositories for list-repos)",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="Bypass the local ETag cache for list-files directory listings",
+    )
+    parser.add_argument(
+        "--cache-files", action="store_true",
+        help="Keep file contents in the local ETag cache (off by default: contents are "
+             "streamed, not written to disk)",
+    )
 
     args = parser.parse_args()
 
@@ -297,39 +315,72 @@ Examples:
     org = conn["organization"]
     project = conn["project"]
     print(f"Organization: {org}  Project: {project}", file=sys.stderr)
+    ctx = AdoContext.from_connection(org, project)
 
     if args.action == "list-repos":
-        list_repos(org, project)
+        list_repos(ctx, name_filter=args.filter, top=args.top)
 
     elif args.action == "list-files":
         if not args.repo:
             print("Error: --repo is required for list-files", file=sys.stderr)
             sys.exit(1)
-        list_files(org, project, args.repo, args.path)
+        list_files(ctx, args.repo, args.path, revalidate=not args.no_cache,
+                   recursion=args.recursion, prefetch=args.prefetch,
+                   cache_files=args.cache_files)
 
     elif args.action == "get-file":
         if not args.repo:
             print("Error: --repo is required for get-file", file=sys.stderr)
             sys.exit(1)
-        get_file(org, project, args.repo, args.path)
+        get_file(ctx, args.repo, args.path, revalidate=args.cache_files)
+
+    elif args.action == "get-files":
+        paths = list(args.paths)
+        if args.paths_from_file:
+            try:
+                if args.paths_from_file == "-":
+                    lines = sys.stdin.read().splitlines()
+                else:
+                    lines = Path(args.paths_from_file).read_text(encoding="utf-8").splitlines()
+            except OSError as e:
+                print(f"Error: cannot read --paths-from-file: {e}", file=sys.stderr)
+                sys.exit(1)
+            paths.extend(line.strip() for line in lines if line.strip())
+        if not args.repo or not paths:
+            print("Error: --repo and --paths (or --paths-from-file) are required for get-files",
+                  file=sys.stderr)
+            sys.exit(1)
+        get_files(ctx, args.repo, paths, revalidate=args.cache_files)
 
     elif args.action == "search":
         if not args.query:
             print("Error: --query is required for search", file=sys.stderr)
             sys.exit(1)
         search_code(
-            org, project, args.query,
+            ctx, args.query,
             repo_filter=args.repo_filter,
             path_filter=args.path_filter,
             extension_filter=args.extension_filter,
-            top=args.top,
+            top=args.top if args.top is not None else 25,
         )
 
     elif args.action == "git-history":
         if not args.repo:
             print("Error: --repo is required for git-history", file=sys.stderr)
             sys.exit(1)
-        git_history(org, project, args.repo, path=args.path if args.path != "/" else None, top=args.top)
+        git_history(ctx, args.repo, path=args.path if args.path != "/" else None,
+                    top=args.top if args.top is not None else 25)
+
+    elif args.action == "batch":
+        try:
+            ops = json_io.load(sys.stdin)
+        except ValueError as e:
+            print(f"Error: batch expects a JSON list of ops on stdin: {e}", file=sys.stderr)
+            sys.exit(1)
+        if not isinstance(ops, list):
+            print("Error: batch expects a JSON list of ops on stdin", file=sys.stderr)
+            sys.exit(1)
+        run_batch(ctx, ops, revalidate=not args.no_cache, cache_files=args.cache_files)
 
 
 if __name__ == "__main__":
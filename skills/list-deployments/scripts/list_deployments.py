@@ -7,12 +7,13 @@ a deployment database, or configuration management tool).
 """
 
 import argparse
-import json
+import heapq
 import sys
 from pathlib import Path
 
 # Add skills/ to path for shared module imports
 sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from _shared import json_io
 from _shared.preflight import require_provider
 
 
@@ -36,19 +37,16 @@ DEPLOYMENT_STORE = {
 
 
 def list_deployments(customer: str = None, environment: str = None, status: str = None, top: int = 10):
-    results = []
-    for dep_id, dep in DEPLOYMENT_STORE.items():
-        if customer and dep.get("customer") != customer:
-            continue
-        if environment and dep.get("environment") != environment:
-            continue
-        if status and dep.get("status") != status:
-            continue
-        results.append(dep)
-    # Sort by started_at descending
-    results.sort(key=lambda x: x.get("started_at", ""), reverse=True)
-    results = results[:top]
-    print(json.dumps(results, indent=2))
+    # Only the filters that were given; each is (field, wanted value)
+    filters = [(k, v) for k, v in (("customer", customer), ("environment", environment),
+                                   ("status", status)) if v]
+    matches = (
+        dep for dep in DEPLOYMENT_STORE.values()
+        if all(dep.get(k) == v for k, v in filters)
+    )
+    # Newest top N by started_at, without sorting every match
+    results = heapq.nlargest(top, matches, key=lambda x: x.get("started_at", ""))
+    print(json_io.dumps(results))
     print(f"\n--- {len(results)} deployment(s) ---", file=sys.stderr)
 
 
@@ -56,7 +54,7 @@ def get_deployment_details(deployment_id: str):
     if deployment_id not in DEPLOYMENT_STORE:
         print(f"Error: Deployment '{deployment_id}' not found.", file=sys.stderr)
         sys.exit(1)
-    print(json.dumps(DEPLOYMENT_STORE[deployment_id], indent=2))
+    print(json_io.dumps(DEPLOYMENT_STORE[deployment_id]))
 
 
 def main():
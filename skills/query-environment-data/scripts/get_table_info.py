@@ -23,8 +23,6 @@ from _shared.dataverse_helpers import (
     validate_auth_args,
 )
 
-from PowerPlatform.Dataverse.core.errors import HttpError, ValidationError
-
 
 def get_table_columns(client, table_name: str) -> List[Dict[str, str]]:
     """Discover columns by querying a single record and returning column names.
@@ -32,15 +30,15 @@ def get_table_columns(client, table_name: str) -> List[Dict[str, str]]:
     More reliable than the Attributes metadata endpoint because it returns
     the actual queryable column logical names.
     """
+    from PowerPlatform.Dataverse.core.errors import HttpError, ValidationError
+
     try:
         pages = client.get(table_name, top=1)
         for page in pages:
             if page:
-                return [
-                    {"LogicalName": k}
-                    for k in sorted(page[0].keys())
-                    if not is_odata_annotation(k)
-                ]
+                # Drop annotations before sorting; they can be half the keys
+                columns = sorted(k for k in page[0] if not is_odata_annotation(k))
+                return [{"LogicalName": k} for k in columns]
             break
     except (HttpError, ValidationError):
         pass
@@ -74,6 +72,9 @@ Examples:
     args = parser.parse_args()
     validate_auth_args(args)
 
+    # SDK imports wait until arguments are valid so --help and usage errors stay fast
+    from PowerPlatform.Dataverse.core.errors import HttpError, ValidationError
+
     try:
         client = create_client(
             environment_url=args.environment_url,
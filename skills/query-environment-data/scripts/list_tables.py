@@ -2,9 +2,10 @@
 """List all tables in a Dataverse environment."""
 
 import argparse
+import re
 import sys
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 # Add skills/ to path for shared module imports
 sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
@@ -22,14 +23,22 @@ from _shared.dataverse_helpers import (
     validate_auth_args,
 )
 
-from PowerPlatform.Dataverse.core.errors import HttpError, ValidationError
 
+def list_tables(client, search: Optional[str] = None) -> List[Dict[str, str]]:
+    """List all tables, returning name/schema/type info.
 
-def list_tables(client) -> List[Dict[str, str]]:
-    """List all tables, returning name/schema/type info."""
+    search keeps only tables whose logical name contains it (case-insensitive);
+    non-matching tables are skipped before they are reshaped.
+    """
     raw = client.list_tables()
+    # A case-insensitive pattern avoids lowercasing every table name
+    pattern = re.compile(re.escape(search), re.IGNORECASE) if search else None
     tables = []
     for t in raw:
+        if pattern is not None:
+            name = t.get("LogicalName", "") if isinstance(t, dict) else str(t)
+            if not pattern.search(name):
+                continue
         if isinstance(t, dict):
             tables.append({
                 "LogicalName": t.get("LogicalName", ""),
@@ -66,6 +75,9 @@ Examples:
     args = parser.parse_args()
     validate_auth_args(args)
 
+    # SDK imports wait until arguments are valid so --help and usage errors stay fast
+    from PowerPlatform.Dataverse.core.errors import HttpError, ValidationError
+
     try:
         client = create_client(
             environment_url=args.environment_url,
@@ -76,10 +88,7 @@ Examples:
         )
 
         print("Listing tables...", file=sys.stderr)
-        tables = list_tables(client)
-        if args.search:
-            needle = args.search.lower()
-            tables = [t for t in tables if needle in t.get("LogicalName", "").lower()]
+        tables = list_tables(client, search=args.search)
         print(format_output(tables, args.format))
         print(f"\n--- {len(tables)} table(s) found ---", file=sys.stderr)
 
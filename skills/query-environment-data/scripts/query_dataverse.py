@@ -4,7 +4,7 @@
 import argparse
 import sys
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator
 
 # Add skills/ to path for shared module imports
 sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
@@ -18,23 +18,25 @@ from _shared.dataverse_helpers import (
     add_auth_args,
     add_output_args,
     create_client,
-    format_output,
+    print_records,
     query_odata,
     strip_annotations,
     validate_auth_args,
 )
 
-from PowerPlatform.Dataverse.core.errors import HttpError, ValidationError
-
 
 def query_sql(
     client, sql_query: str, include_annotations: bool = False
-) -> List[Dict[str, Any]]:
-    """Execute a read-only SQL query against Dataverse."""
+) -> Iterator[Dict[str, Any]]:
+    """Execute a read-only SQL query against Dataverse.
+
+    Records are yielded lazily (annotations stripped one at a time), so
+    print_records can stream them without building a second list.
+    """
     results = client.query_sql(sql_query)
     if include_annotations:
-        return list(results)
-    return [strip_annotations(r) for r in results]
+        return iter(results)
+    return (strip_annotations(r) for r in results)
 
 
 def main():
@@ -100,6 +102,9 @@ Examples:
     args = parser.parse_args()
     validate_auth_args(args)
 
+    # SDK imports wait until arguments are valid so --help and usage errors stay fast
+    from PowerPlatform.Dataverse.core.errors import HttpError, ValidationError
+
     try:
         client = create_client(
             environment_url=args.environment_url,
@@ -122,10 +127,11 @@ Examples:
                 orderby=args.orderby,
                 top=args.top,
                 include_annotations=args.include_annotations,
+                materialize=False,
             )
 
-        print(format_output(records, args.format))
-        print(f"\n--- {len(records)} record(s) returned ---", file=sys.stderr)
+        count = print_records(records, args.format)
+        print(f"\n--- {count} record(s) returned ---", file=sys.stderr)
 
     except (HttpError, ValidationError) as e:
         print(f"Dataverse Error: {e}", file=sys.stderr)
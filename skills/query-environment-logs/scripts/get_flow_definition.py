@@ -32,9 +32,6 @@ from _shared.flow_helpers import (
     resolve_flow_id,
 )
 
-from PowerPlatform.Dataverse.client import DataverseClient
-from PowerPlatform.Dataverse.core.errors import HttpError, ValidationError
-
 
 def _format_definition(defn_response: Dict[str, Any]) -> Dict[str, Any]:
     """Extract the relevant parts of a flow definition response."""
@@ -82,6 +79,10 @@ Examples:
     args = parser.parse_args()
     validate_auth_args(args)
 
+    # SDK imports wait until arguments are valid so --help and usage errors stay fast
+    from PowerPlatform.Dataverse.client import DataverseClient
+    from PowerPlatform.Dataverse.core.errors import HttpError, ValidationError
+
     try:
         credential = create_credential(
             environment_url=args.environment_url,
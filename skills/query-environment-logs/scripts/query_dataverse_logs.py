@@ -25,13 +25,11 @@ from _shared.dataverse_helpers import (
     add_auth_args,
     add_output_args,
     create_client,
-    format_output,
+    print_records,
     query_odata,
     validate_auth_args,
 )
 
-from PowerPlatform.Dataverse.core.errors import HttpError, ValidationError
-
 
 LOG_TYPES: Dict[str, Dict[str, Any]] = {
     "flow-runs": {
@@ -190,6 +188,9 @@ Examples:
     args = parser.parse_args()
     validate_auth_args(args)
 
+    # SDK imports wait until arguments are valid so --help and usage errors stay fast
+    from PowerPlatform.Dataverse.core.errors import HttpError, ValidationError
+
     try:
         client = create_client(
             environment_url=args.environment_url,
@@ -217,10 +218,11 @@ Examples:
             orderby=config["orderby"],
             top=args.top,
             include_annotations=args.include_annotations,
+            materialize=False,
         )
 
-        print(format_output(records, args.format))
-        print(f"\n--- {len(records)} record(s) returned ---", file=sys.stderr)
+        count = print_records(records, args.format)
+        print(f"\n--- {count} record(s) returned ---", file=sys.stderr)
 
     except (HttpError, ValidationError) as e:
         print(f"Dataverse Error: {e}", file=sys.stderr)
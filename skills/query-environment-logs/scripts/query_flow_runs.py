@@ -3,7 +3,7 @@
 
 Two modes:
 - Without --run-id: list recent runs with status, error summaries, and trigger info.
-- With --run-id:    get a single run with per-action detail (status, errors, timing).
+- With --run-id:    get one or more runs with per-action detail (status, errors, timing).
 """
 
 import argparse
@@ -28,15 +28,12 @@ from _shared.dataverse_helpers import (
 )
 from _shared.flow_helpers import (
     discover_flow_api_base,
-    get_flow_run_with_actions,
+    get_flow_runs_with_actions,
     list_flow_runs,
     resolve_environment_id,
     resolve_flow_id,
 )
 
-from PowerPlatform.Dataverse.client import DataverseClient
-from PowerPlatform.Dataverse.core.errors import HttpError, ValidationError
-
 
 def _resolve_flow_context(client, credential, environment_url: str,
                           flow_name=None, flow_id=None) -> Dict[str, str]:
@@ -107,6 +104,10 @@ Examples:
   %(prog)s --environment-url https://org.crm4.dynamics.com --interactive \\
     --flow-name my_flow --run-id 08585000000000000000000000000CU100
 
+  # Several runs at once (fetched concurrently)
+  %(prog)s --environment-url https://org.crm4.dynamics.com --interactive \\
+    --flow-name my_flow --run-id 08585000000000000000000000000CU100 08585000000000000000000000000CU101
+
   # Use flow ID instead of name
   %(prog)s --environment-url https://org.crm4.dynamics.com --interactive \\
     --flow-id 00000000-0000-0000-0000-000000000000 --status failed --top 3
@@ -127,7 +128,9 @@ Examples:
 
     parser.add_argument(
         "--run-id",
-        help="Specific run ID for action-level detail (logic app run ID from flowrun.name)",
+        nargs="+",
+        help="Run ID(s) for action-level detail (logic app run ID from flowrun.name); "
+             "several IDs are fetched concurrently",
     )
     parser.add_argument(
         "--status",
@@ -145,6 +148,10 @@ Examples:
     args = parser.parse_args()
     validate_auth_args(args)
 
+    # SDK imports wait until arguments are valid so --help and usage errors stay fast
+    from PowerPlatform.Dataverse.client import DataverseClient
+    from PowerPlatform.Dataverse.core.errors import HttpError, ValidationError
+
     try:
         credential = create_credential(
             environment_url=args.environment_url,
@@ -161,25 +168,33 @@ Examples:
         )
 
         if args.run_id:
-            print(f"Getting run {args.run_id} with action details...", file=sys.stderr)
-            run = get_flow_run_with_actions(
+            print(f"Getting {len(args.run_id)} run(s) with action details...", file=sys.stderr)
+            runs = get_flow_runs_with_actions(
                 credential, ctx["flow_api_base"], ctx["environment_id"],
                 ctx["flow_resource_id"], args.run_id,
             )
-            actions = _format_run_actions(run)
-            props = run.get("properties", {})
-            output = {
-                "run_id": args.run_id,
-                "status": props.get("status", ""),
-                "error": props.get("error", {}),
-                "trigger": props.get("trigger", {}).get("name", ""),
-                "startTime": props.get("startTime", ""),
-                "endTime": props.get("endTime", ""),
-                "actions": actions,
-            }
-            print(format_output(output, args.format))
-            failed = [a for a in actions if a["status"] == "Failed"]
-            print(f"\n--- {len(actions)} action(s), {len(failed)} failed ---", file=sys.stderr)
+            outputs = []
+            for run_id, run in zip(args.run_id, runs):
+                actions = _format_run_actions(run)
+                props = run.get("properties", {})
+                outputs.append({
+                    "run_id": run_id,
+                    "status": props.get("status", ""),
+                    "error": props.get("error", {}),
+                    "trigger": props.get("trigger", {}).get("name", ""),
+                    "startTime": props.get("startTime", ""),
+                    "endTime": props.get("endTime", ""),
+                    "actions": actions,
+                })
+            # A single run keeps the original single-object output shape
+            print(format_output(outputs[0] if len(outputs) == 1 else outputs, args.format))
+            for output in outputs:
+                failed = [a for a in output["actions"] if a["status"] == "Failed"]
+                print(
+                    f"\n--- {output['run_id']}: {len(output['actions'])} action(s), "
+                    f"{len(failed)} failed ---",
+                    file=sys.stderr,
+                )
         else:
             status_filter = args.status.capitalize() if args.status else None
             print(f"Listing recent runs (top {args.top})...", file=sys.stderr)
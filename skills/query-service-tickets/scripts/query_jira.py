@@ -10,10 +10,12 @@ from pathlib import Path
 # Add skills/ to path for shared module imports
 sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 from _shared.jira_helpers import (
+    JiraHTTPError,
     add_output_args,
     adf_to_text,
     format_output,
     jira_request,
+    offset_paginated,
     search_issues_paginated,
     servicedesk_paginated,
 )
@@ -91,30 +93,21 @@ def do_get_comments(args, email, api_token):
         print("Error: --issue-key is required for get-comments", file=sys.stderr)
         sys.exit(1)
 
+    comments = offset_paginated(
+        args.server, email, api_token,
+        f"/rest/api/3/issue/{args.issue_key}/comment",
+        values_key="comments",
+    )
+
     all_comments = []
-    start_at = 0
-
-    while True:
-        data = jira_request(
-            args.server,
-            f"/rest/api/3/issue/{args.issue_key}/comment",
-            email=email,
-            api_token=api_token,
-            params={"startAt": start_at, "maxResults": 100},
-        )
-
-        for c in data.get("comments", []):
-            all_comments.append({
-                "id": c["id"],
-                "author": (c.get("author") or {}).get("displayName"),
-                "body": adf_to_text(c.get("body")),
-                "created": c.get("created"),
-                "updated": c.get("updated"),
-            })
-
-        if start_at + len(data.get("comments", [])) >= data.get("total", 0):
-            break
-        start_at += len(data.get("comments", []))
+    for c in comments:
+        all_comments.append({
+            "id": c["id"],
+            "author": (c.get("author") or {}).get("displayName"),
+            "body": adf_to_text(c.get("body")),
+            "created": c.get("created"),
+            "updated": c.get("updated"),
+        })
 
     print(format_output(all_comments, args.format))
     print(f"\n--- {len(all_comments)} comment(s) ---", file=sys.stderr)
@@ -271,7 +264,11 @@ Examples:
         "download-attachment": do_download_attachment,
     }
 
-    actions[args.action](args, email, api_token)
+    try:
+        actions[args.action](args, email, api_token)
+    except JiraHTTPError as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
 
 
 if __name__ == "__main__":